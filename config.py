@@ -41,6 +41,35 @@ for d in [INPUT_DIR, VIDEOS_INPUT_DIR, OUTPUT_DIR, MODELS_DIR, LOGS_DIR,
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
 WHISPER_MODEL_SIZE = os.getenv("WHISPER_MODEL", "large-v3")
+# Acima de ~4 threads o decoder em CPU satura a banda de memória e fica mais lento; os scripts
+# fixam OMP_NUM_THREADS antes dos imports pesados (4, ou 1 no v4, que paraleliza por processos)
+WHISPER_CPU_THREADS = int(os.getenv("WHISPER_CPU_THREADS", min(4, os.cpu_count() or 4)))
+# "auto" = int8_float16 na GPU e int8 na CPU; ou force um tipo do CTranslate2 (ex.: int8_float32, float16)
+WHISPER_COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE", "auto")
+# Silero VAD do faster-whisper: trechos de silêncio/música cortados não passam pelo encoder
+VAD_PROFILES = {
+    # Fala contínua (aulas, entrevistas): corta pausas longas, mantém 200ms de margem
+    "speech_only": dict(min_speech_duration_ms=200, min_silence_duration_ms=700, speech_pad_ms=200),
+    # Muita música de fundo: limiar mais alto e só pausas de 1s+ viram corte
+    "music_heavy": dict(threshold=0.6, min_speech_duration_ms=200, min_silence_duration_ms=1000, speech_pad_ms=200),
+}
+VAD_PROFILE = os.getenv("VAD_PROFILE", "speech_only")
+if VAD_PROFILE not in VAD_PROFILES:
+    print(f"⚠️ VAD_PROFILE '{VAD_PROFILE}' desconhecido (opções: {', '.join(VAD_PROFILES)}); usando speech_only")
+    VAD_PROFILE = "speech_only"
+# Vocabulário do projeto (nomes, termos técnicos) para o Whisper começar no contexto certo
+WHISPER_INITIAL_PROMPT = os.getenv("WHISPER_INITIAL_PROMPT") or None
+
+# --- FFmpeg / Lote ---
+# Threads de cada libx264 quando há vários vídeos em paralelo (sozinho, o ffmpeg decide)
+FFMPEG_THREADS = int(os.getenv("FFMPEG_THREADS", 2))
+# Cada vídeo em paralelo é um video_translator.py inteiro (Whisper + Gemini + encode):
+# mais de 1 só com RAM/VRAM para vários modelos carregados ao mesmo tempo
+VIDEOS_PARALELOS = int(os.getenv("VIDEOS_PARALELOS", 1))
+
+# --- Logging ---
+LOG_FILE = LOGS_DIR / "bot_traducao.log"
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 
 # --- Configurações Técnicas ---
 MAX_VIDEO_SIZE_MB = 2048
@@ -17,7 +17,6 @@ Uso:
 """
 
 import os
-import subprocess
 import tempfile
 import argparse
 from pathlib import Path
@@ -26,6 +25,7 @@ from functools import partial
 
 # Importar configurações
 from config import SUBTITLES_EN_DIR, WHISPER_MODEL, MODELS_DIR
+from utils import executar_ffmpeg
 
 # Configurações
 PASTA_ENTRADA = "proximos_para_traducao"
@@ -50,8 +50,7 @@ def extrair_audio_bruto(video_path):
         audio_tmp.name
     ]
     
-    result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
-    if result.returncode == 0:
+    if executar_ffmpeg(cmd):
         return audio_tmp.name
     else:
         if os.path.exists(audio_tmp.name):
@@ -82,7 +81,8 @@ def limpar_audio_com_filtros(audio_bruto):
         audio_limpo.name
     ]
     
-    result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+    # Erro do filtro só aparece se o fallback também falhar
+    executar_ffmpeg(cmd, mostrar_erro=False)
     
     if os.path.exists(audio_limpo.name) and os.path.getsize(audio_limpo.name) > 1000:
         return audio_limpo.name
@@ -104,7 +104,7 @@ def limpar_audio_com_filtros(audio_bruto):
         audio_limpo_fb.name
     ]
     
-    subprocess.run(cmd_fallback, capture_output=True, text=True, timeout=300)
+    executar_ffmpeg(cmd_fallback)
     
     if os.path.exists(audio_limpo_fb.name) and os.path.getsize(audio_limpo_fb.name) > 1000:
         return audio_limpo_fb.name
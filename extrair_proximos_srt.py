@@ -66,9 +66,9 @@ def extrair_srt(video_path):
                 without_timestamps=False
             )
             
-            # Salvar SRT
+            # Salvar SRT (buffer de 1 MiB: o disco só é tocado no flush final)
             contador = 0
-            with open(srt_saida, 'w', encoding='utf-8') as f:
+            with open(srt_saida, 'w', encoding='utf-8', buffering=1 << 20) as f:
                 for segment in segments:
                     contador += 1
                     start = format_timestamp(segment.start)
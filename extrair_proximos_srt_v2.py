@@ -19,12 +19,12 @@ PÓS-PROCESSAMENTO:
 """
 
 import os
-import subprocess
 import tempfile
 from pathlib import Path
 import time
 from faster_whisper import WhisperModel
 from config import SUBTITLES_EN_DIR, SUBTITLES_OUTPUT_DIR, VIDEOS_OUTPUT_DIR, WHISPER_MODEL, MODELS_DIR
+from utils import executar_ffmpeg
 
 # Importar ferramentas do pipeline
 try:
@@ -107,8 +107,7 @@ def extrair_audio_bruto(video_path):
         audio_tmp.name
     ]
     
-    result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
-    if result.returncode == 0:
+    if executar_ffmpeg(cmd):
         return audio_tmp.name
     else:
         if os.path.exists(audio_tmp.name):
@@ -149,7 +148,8 @@ def limpar_audio_com_filtros(audio_bruto):
         audio_limpo.name
     ]
     
-    result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+    # Erro do filtro só aparece se o fallback também falhar
+    executar_ffmpeg(cmd, mostrar_erro=False)
     
     # Verifica se arquivo foi criado e tem tamanho > 0
     if os.path.exists(audio_limpo.name) and os.path.getsize(audio_limpo.name) > 1000:
@@ -174,7 +174,7 @@ def limpar_audio_com_filtros(audio_bruto):
         audio_limpo_fb.name
     ]
     
-    result_fb = subprocess.run(cmd_fallback, capture_output=True, text=True, timeout=300)
+    executar_ffmpeg(cmd_fallback)
     
     if os.path.exists(audio_limpo_fb.name) and os.path.getsize(audio_limpo_fb.name) > 1000:
         return audio_limpo_fb.name
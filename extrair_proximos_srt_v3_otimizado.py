@@ -17,13 +17,19 @@ ANTI-ALUCINAÇÃO:
 - Thresholds rigorosos para evitar transcrever ruído
 """
 
+import math
 import os
+import re
 import subprocess
 import tempfile
+import threading
+from bisect import bisect_left, bisect_right
+from collections import deque
+from functools import lru_cache
 from pathlib import Path
-import time
 import numpy as np
 from faster_whisper import WhisperModel
+from faster_whisper.vad import VadOptions, get_speech_timestamps
 from config import SUBTITLES_EN_DIR, SUBTITLES_OUTPUT_DIR, VIDEOS_OUTPUT_DIR, WHISPER_MODEL, MODELS_DIR
 
 # Importar ferramentas do pipeline
@@ -35,18 +41,54 @@ except ImportError:
     def traduzir_srt_gemini(*args): return False
     def embutir_legenda(*args): return False
 
+def detectar_compute_type():
+    """
+    Escolhe o compute_type mais rápido que o CTranslate2 suporta nesta CPU.
+    
+    - int8_float16: CPUs com FP16 nativo (ex: ARM com NEON)
+    - int8: x86 com AVX2/AVX-512 (o CT2 usa kernels VNNI sozinho se existirem)
+    """
+    try:
+        import ctranslate2
+        suportados = ctranslate2.get_supported_compute_types("cpu")
+    except Exception:
+        return "int8"
+    
+    for tipo in ("int8_float16", "int8", "int8_float32"):
+        if tipo in suportados:
+            return tipo
+    return "float32"
+
 # Configurações
 PASTA_ENTRADA = "proximos_para_traducao"
 PASTA_SAIDA = str(SUBTITLES_EN_DIR)
 MODELO = WHISPER_MODEL
 DEVICE = "cpu"
-COMPUTE_TYPE = "int8"
+COMPUTE_TYPE = os.environ.get("COMPUTE_TYPE") or detectar_compute_type()
+CPU_THREADS = os.cpu_count() or 4  # Pool de threads do CT2 usando todos os núcleos
+TAXA_AMOSTRAGEM = 16000  # Hz (nativo do Whisper)
+TIMEOUT_FFMPEG = 300  # segundos
+LINHAS_STDERR_FFMPEG = 50  # Últimas linhas do stderr guardadas para diagnóstico
+
+# Análise de ruído: acima dessa faixa dinâmica o afftdn é dispensável
+LIMITE_FAIXA_DINAMICA_LIMPA = 30.0  # dB
+DURACAO_ANALISE_RUIDO = 120  # segundos analisados no início do vídeo
 
 # Parâmetros de Qualidade
 LIMITE_NO_SPEECH = 0.6  # Se > 0.6, provavelmente é silêncio/ruído
 LIMITE_AVG_LOGPROB = -1.0  # Confiança mínima da transcrição
 LIMITE_CPS = 25  # Caracteres por segundo (acima é difícil ler)
 
+# Parâmetros do VAD (Silero)
+# threshold 0.3 (padrão Silero = 0.5) para não descartar sussurros/fala baixa
+VAD_PARAMETROS = {
+    "threshold": 0.3,
+    "min_speech_duration_ms": 150,
+    "min_silence_duration_ms": 500
+}
+VAD_THRESHOLD_AUDIO_BAIXO = 0.2  # Usado quando o áudio está muito baixo
+LIMITE_RMS_BAIXO_DBFS = -35.0  # Abaixo disso o áudio é considerado "baixo"
+
 # Lista de alucinações conhecidas do Whisper
 ALUCINACOES_COMUNS = [
     "thank you for watching",
@@ -88,6 +130,111 @@ def quebrar_legenda_netflix(texto, max_chars=42, max_linhas=2):
     
     return "\n".join(linhas[:max_linhas])
 
+def obter_duracao_video(video_path):
+    """
+    Obtém a duração do vídeo em segundos usando ffprobe.
+    
+    Returns:
+        float: Duração em segundos, ou None se falhar
+    """
+    try:
+        cmd = [
+            'ffprobe',
+            '-v', 'error',
+            '-show_entries', 'format=duration',
+            '-of', 'default=noprint_wrappers=1:nokey=1',
+            video_path
+        ]
+        
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
+        if result.returncode == 0 and result.stdout.strip():
+            return float(result.stdout.strip())
+        return None
+        
+    except Exception as e:
+        print(f"    ⚠️ Erro ao obter duração: {e}")
+        return None
+
+def ler_pcm_do_pipe(stream, amostras_estimadas):
+    """
+    Lê PCM s16le do pipe direto para um buffer NumPy pré-alocado (readinto).
+    
+    Nenhum objeto bytes intermediário é criado: o FFmpeg escreve no pipe e o
+    kernel copia direto para a memória do array. Se a estimativa for curta,
+    o buffer dobra de tamanho; se sobrar, o resultado é fatiado.
+    
+    Returns:
+        numpy.array: Amostras int16 lidas
+    """
+    buffer = np.empty(max(amostras_estimadas, TAXA_AMOSTRAGEM), dtype=np.int16)
+    bytes_lidos = 0
+    
+    while True:
+        visao = memoryview(buffer).cast('B')
+        if bytes_lidos == len(visao):
+            maior = np.empty(len(buffer) * 2, dtype=np.int16)
+            maior[:len(buffer)] = buffer
+            buffer = maior
+            continue
+        
+        n = stream.readinto(visao[bytes_lidos:])
+        if not n:
+            break
+        bytes_lidos += n
+    
+    return buffer[:bytes_lidos // 2]
+
+@lru_cache(maxsize=4)
+def analisar_audio(video_path):
+    """
+    Passada rápida de análise (astats) nos primeiros minutos do áudio original,
+    antes de qualquer filtro. Memoizada: audio_eh_limpo e o VAD reaproveitam a mesma passada.
+    
+    Returns:
+        dict: {"pico", "piso", "rms"} em dB (seção "Overall" do astats), ou None se falhar
+    """
+    comando = [
+        "ffmpeg",
+        "-hide_banner", "-nostats",
+        "-t", str(DURACAO_ANALISE_RUIDO),
+        "-i", video_path,
+        "-vn",
+        "-ac", "1",
+        "-ar", "16000",
+        "-af", "astats",
+        "-f", "null",
+        "-"
+    ]
+    
+    try:
+        result = subprocess.run(comando, capture_output=True, text=True, timeout=60)
+    except Exception:
+        return None
+    
+    metricas = {}
+    for chave, rotulo in (("pico", "Peak level dB"), ("piso", "Noise floor dB"), ("rms", "RMS level dB")):
+        valores = re.findall(rf"{rotulo}:\s*(-?[\d.]+|-inf)", result.stderr)
+        if not valores:
+            return None
+        # A última ocorrência é a seção "Overall" do astats
+        metricas[chave] = float(valores[-1])
+    return metricas
+
+def audio_eh_limpo(video_path):
+    """
+    Se a faixa dinâmica (pico - piso de ruído) passa de LIMITE_FAIXA_DINAMICA_LIMPA,
+    o áudio é limpo (TV/filme masterizado) e o afftdn pode ser pulado.
+    Na dúvida (erro/sem métricas/valor não finito), assume áudio ruidoso e mantém o filtro:
+    piso -inf (trecho analisado em silêncio digital) daria faixa infinita e passaria como limpo.
+    """
+    metricas = analisar_audio(video_path)
+    if metricas is None:
+        return False
+    faixa_dinamica = metricas["pico"] - metricas["piso"]
+    if not math.isfinite(faixa_dinamica):
+        return False
+    return faixa_dinamica > LIMITE_FAIXA_DINAMICA_LIMPA
+
 def carregar_audio_via_pipe(video_path):
     """
     Usa FFmpeg para extrair, normalizar e enviar o áudio diretamente para a memória (Pipe).
@@ -95,6 +242,7 @@ def carregar_audio_via_pipe(video_path):
     Aplica:
     - dynaudnorm: Normalização dinâmica (ótimo para picos/sussurros)
     - arnndn: Redução de ruído com IA (se disponível, senão usa afftdn)
+    - afftdn só quando o áudio é ruidoso (ver audio_eh_limpo)
     - highpass/lowpass: Remove frequências fora da voz humana
     - ar=16000: Taxa de amostragem nativa do Whisper
     - ac=1: Mono (Whisper não precisa de estéreo)
@@ -120,10 +268,19 @@ def carregar_audio_via_pipe(video_path):
         "lowpass=f=3000"
     )
     
+    # Filtro para áudio limpo (sem afftdn, a etapa mais cara da cadeia)
+    filtro_limpo = (
+        "dynaudnorm=f=150:g=15:p=0.9,"
+        "highpass=f=200,"
+        "lowpass=f=3000"
+    )
+    
+    filtro = filtro_limpo if audio_eh_limpo(video_path) else filtro_fallback
+    
     comando = [
         "ffmpeg",
         "-i", video_path,
-        "-af", filtro_fallback,  # Usar fallback por padrão (mais compatível)
+        "-af", filtro,
         "-ar", "16000",
         "-ac", "1",
         "-f", "s16le",
@@ -131,26 +288,49 @@ def carregar_audio_via_pipe(video_path):
         "-"
     ]
     
+    # Estimativa do tamanho do PCM para pré-alocar o buffer
+    duracao = obter_duracao_video(video_path)
+    amostras_estimadas = int((duracao or 600) * TAXA_AMOSTRAGEM * 1.01)
+    
     try:
         processo = subprocess.Popen(
             comando,
             stdout=subprocess.PIPE,
-            stderr=subprocess.DEVNULL
+            stderr=subprocess.PIPE,
+            bufsize=1 << 20
+        )
+        
+        # stderr drenado em paralelo: guarda só as últimas linhas para diagnóstico
+        # e impede que um pipe de stderr cheio trave o FFmpeg (e o stdout)
+        cauda_stderr = deque(maxlen=LINHAS_STDERR_FFMPEG)
+        leitor_stderr = threading.Thread(
+            target=lambda: cauda_stderr.extend(iter(processo.stderr.readline, b'')),
+            daemon=True
         )
+        leitor_stderr.start()
         
-        dados_raw, _ = processo.communicate(timeout=300)
+        # Timeout de 300s (mesmo limite do antigo communicate)
+        watchdog = threading.Timer(TIMEOUT_FFMPEG, processo.kill)
+        watchdog.start()
+        try:
+            pcm = ler_pcm_do_pipe(processo.stdout, amostras_estimadas)
+            processo.wait()
+        finally:
+            watchdog.cancel()
+            leitor_stderr.join(timeout=5)
         
-        if processo.returncode != 0 or len(dados_raw) == 0:
+        if processo.returncode != 0 or len(pcm) == 0:
+            if cauda_stderr:
+                print(f"\n    ⚠️ FFmpeg (código {processo.returncode}):")
+                for linha in cauda_stderr:
+                    print(f"       {linha.decode('utf-8', errors='replace').rstrip()}")
             return None
         
-        # Converte bytes para array NumPy float32 (formato esperado pelo Whisper)
-        audio_array = np.frombuffer(dados_raw, np.int16).flatten().astype(np.float32) / 32768.0
+        # Converte int16 para float32 normalizado (formato esperado pelo Whisper)
+        audio_array = pcm.astype(np.float32) / 32768.0
         
         return audio_array
         
-    except subprocess.TimeoutExpired:
-        processo.kill()
-        return None
     except Exception as e:
         print(f"    ⚠️ Erro no pipe: {str(e)[:50]}")
         return None
@@ -163,101 +343,168 @@ def format_timestamp(seconds):
     millis = int((seconds % 1) * 1000)
     return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
 
-def transcrever_audio_otimizado(audio_array, model):
+def parametros_vad_para(rms_dbfs):
+    """
+    Retorna os parâmetros de VAD adequados ao nível RMS do áudio original (antes do
+    dynaudnorm, que deixa qualquer faixa com nível parecido).
+    Em áudio muito baixo (< LIMITE_RMS_BAIXO_DBFS) o threshold cai ainda mais;
+    nível desconhecido (None) mantém o padrão.
+    """
+    parametros = dict(VAD_PARAMETROS)
+    if rms_dbfs is not None and rms_dbfs < LIMITE_RMS_BAIXO_DBFS:
+        parametros["threshold"] = VAD_THRESHOLD_AUDIO_BAIXO
+    return parametros
+
+def detectar_trechos_fala(audio_array, vad_parameters):
     """
-    Transcreve áudio com filtros de confiança integrados.
+    Roda o Silero VAD (embutido no faster-whisper) UMA vez sobre o áudio inteiro.
     
-    Retorna apenas segmentos de alta qualidade:
+    Returns:
+        list: Trechos de fala [{'start': amostra, 'end': amostra}, ...]
+    """
+    return get_speech_timestamps(audio_array, VadOptions(**vad_parameters))
+
+def concatenar_trechos_fala(audio_array, trechos):
+    """
+    Junta apenas os trechos de fala num áudio compacto (silêncio descartado).
+    
+    Returns:
+        tuple: (audio_fala, inicios_compactos, inicios_originais)
+               Os inícios (em segundos) permitem remapear timestamps depois.
+    """
+    pedacos = []
+    inicios_compactos = []
+    inicios_originais = []
+    offset = 0
+    
+    for trecho in trechos:
+        pedaco = audio_array[trecho['start']:trecho['end']]
+        pedacos.append(pedaco)
+        inicios_compactos.append(offset / TAXA_AMOSTRAGEM)
+        inicios_originais.append(trecho['start'] / TAXA_AMOSTRAGEM)
+        offset += len(pedaco)
+    
+    return np.concatenate(pedacos), inicios_compactos, inicios_originais
+
+def remapear_tempo(t, inicios_compactos, inicios_originais, fim=False):
+    """
+    Converte um tempo do áudio compacto para o tempo original do vídeo.
+    
+    Um fim que cai exatamente na fronteira entre dois trechos pertence
+    ao trecho anterior (senão a legenda "atravessaria" o silêncio removido).
+    """
+    if fim:
+        idx = bisect_left(inicios_compactos, t) - 1
+    else:
+        idx = bisect_right(inicios_compactos, t) - 1
+    idx = max(idx, 0)
+    return inicios_originais[idx] + (t - inicios_compactos[idx])
+
+def novas_stats():
+    """Contadores dos filtros de qualidade (preenchidos durante a transcrição)."""
+    return {
+        'total': 0,
+        'no_speech': 0,
+        'low_prob': 0,
+        'alucinacao': 0,
+        'cps_alto': 0,
+        'aprovados': 0
+    }
+
+def iterar_segmentos_filtrados(audio_array, model, stats, rms_dbfs=None):
+    """
+    Transcreve áudio com filtros de confiança integrados (gerador).
+    
+    Produz apenas segmentos de alta qualidade, um a um, conforme o Whisper
+    os decodifica (nada é acumulado em lista):
     - Filtra por no_speech_prob (probabilidade de silêncio)
     - Filtra por avg_logprob (confiança da transcrição)
     - Detecta alucinações conhecidas
     - Verifica CPS (legibilidade)
+    
+    O VAD roda UMA vez aqui fora: o Whisper só recebe os trechos de fala
+    concatenados (silêncio nunca passa pelo encoder) e os timestamps são
+    remapeados para o tempo original do vídeo.
+    
+    Args:
+        stats: dict de novas_stats(), atualizado durante a iteração
+        rms_dbfs: nível do áudio antes da normalização (analisar_audio), ou None
     """
-    try:
-        vad_parameters = {
-            "threshold": 0.5,
-            "min_speech_duration_ms": 250,
-            "min_silence_duration_ms": 500
-        }
-        
-        segments, info = model.transcribe(
-            audio_array,
-            language="en",
-            beam_size=5,
-            without_timestamps=False,
-            condition_on_previous_text=False,
-            vad_filter=True,
-            vad_parameters=vad_parameters,
-            no_speech_threshold=0.4,
-            log_prob_threshold=-0.9,
-            compression_ratio_threshold=2.4,
-            word_timestamps=True,
-        )
+    vad_parameters = parametros_vad_para(rms_dbfs)
+    
+    trechos = detectar_trechos_fala(audio_array, vad_parameters)
+    if not trechos:
+        print("(VAD: nenhuma fala detectada)", end=" ", flush=True)
+        return
+    
+    audio_fala, inicios_compactos, inicios_originais = concatenar_trechos_fala(audio_array, trechos)
+    
+    segments, info = model.transcribe(
+        audio_fala,
+        language="en",
+        beam_size=5,
+        without_timestamps=False,
+        condition_on_previous_text=False,
+        vad_filter=False,  # VAD já aplicado acima (evita trabalho dobrado)
+        no_speech_threshold=0.4,
+        log_prob_threshold=-0.9,
+        compression_ratio_threshold=2.4,
+        word_timestamps=True,
+    )
+    
+    for segment in segments:
+        stats['total'] += 1
         
-        # Filtrar segmentos por qualidade
-        segmentos_filtrados = []
-        stats = {
-            'total': 0,
-            'no_speech': 0,
-            'low_prob': 0,
-            'alucinacao': 0,
-            'cps_alto': 0,
-            'aprovados': 0
-        }
+        # Filtro 1: Probabilidade de Não-Fala
+        if segment.no_speech_prob > LIMITE_NO_SPEECH:
+            stats['no_speech'] += 1
+            continue
         
-        for segment in segments:
-            stats['total'] += 1
-            
-            # Filtro 1: Probabilidade de Não-Fala
-            if segment.no_speech_prob > LIMITE_NO_SPEECH:
-                stats['no_speech'] += 1
-                continue
-            
-            # Filtro 2: Confiança da transcrição
-            if segment.avg_logprob < LIMITE_AVG_LOGPROB:
-                stats['low_prob'] += 1
-                continue
-            
-            # Filtro 3: Alucinações conhecidas
-            texto = segment.text.strip()
-            if eh_alucinacao_conhecida(texto):
-                stats['alucinacao'] += 1
-                continue
-            
-            # Filtro 4: CPS (apenas alerta, não bloqueia)
-            duracao = segment.end - segment.start
-            if duracao > 0:
-                cps = len(texto) / duracao
-                if cps > LIMITE_CPS:
-                    stats['cps_alto'] += 1
-            
-            stats['aprovados'] += 1
-            segmentos_filtrados.append({
-                'start': segment.start,
-                'end': segment.end,
-                'text': texto,
-                'no_speech_prob': segment.no_speech_prob,
-                'avg_logprob': segment.avg_logprob
-            })
+        # Filtro 2: Confiança da transcrição
+        if segment.avg_logprob < LIMITE_AVG_LOGPROB:
+            stats['low_prob'] += 1
+            continue
         
-        # Log de estatísticas
-        if stats['total'] > 0:
-            filtrados = stats['no_speech'] + stats['low_prob'] + stats['alucinacao']
-            if filtrados > 0:
-                print(f"(filtrou {filtrados}: {stats['no_speech']} silêncio, "
-                      f"{stats['low_prob']} baixa conf., {stats['alucinacao']} aluc.)", 
-                      end=" ", flush=True)
+        # Filtro 3: Alucinações conhecidas
+        texto = segment.text.strip()
+        if eh_alucinacao_conhecida(texto):
+            stats['alucinacao'] += 1
+            continue
         
-        return segmentos_filtrados
+        # Filtro 4: CPS (apenas alerta, não bloqueia)
+        duracao = segment.end - segment.start
+        if duracao > 0:
+            cps = len(texto) / duracao
+            if cps > LIMITE_CPS:
+                stats['cps_alto'] += 1
         
-    except Exception as e:
-        print(f"    ❌ Transcrição falhou: {str(e)[:60]}")
-        return None
+        stats['aprovados'] += 1
+        yield {
+            'start': remapear_tempo(segment.start, inicios_compactos, inicios_originais),
+            'end': remapear_tempo(segment.end, inicios_compactos, inicios_originais, fim=True),
+            'text': texto,
+            'no_speech_prob': segment.no_speech_prob,
+            'avg_logprob': segment.avg_logprob
+        }
+
+def imprimir_stats(stats):
+    """Log de estatísticas dos filtros"""
+    if stats['total'] > 0:
+        filtrados = stats['no_speech'] + stats['low_prob'] + stats['alucinacao']
+        if filtrados > 0:
+            print(f"(filtrou {filtrados}: {stats['no_speech']} silêncio, "
+                  f"{stats['low_prob']} baixa conf., {stats['alucinacao']} aluc.)", 
+                  end=" ", flush=True)
 
 def salvar_srt(segments, output_path):
-    """Salva segmentos em SRT com formatação Netflix"""
+    """
+    Salva segmentos em SRT com formatação Netflix.
+    
+    Aceita qualquer iterável (inclusive o gerador da transcrição): cada bloco
+    é escrito assim que chega, sobrepondo a escrita com a decodificação.
+    """
     contador = 0
-    with open(output_path, 'w', encoding='utf-8') as f:
+    with open(output_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
         for segment in segments:
             texto = quebrar_legenda_netflix(segment['text'], max_chars=42, max_linhas=2)
             
@@ -286,15 +533,25 @@ def extrair_srt_otimizado(video_path, model):
             return nome_video, False
         print("✓")
         
-        print(f"  2️⃣ Transcrevendo com filtros...", end=" ", flush=True)
-        segments = transcrever_audio_otimizado(audio_array, model)
-        if segments is None or len(segments) == 0:
+        # Transcrição e escrita do SRT numa única passada
+        print(f"  2️⃣ Transcrevendo com filtros e salvando SRT...", end=" ", flush=True)
+        stats = novas_stats()
+        # Mesma passada astats do audio_eh_limpo (memoizada): nível medido antes do dynaudnorm
+        metricas = analisar_audio(video_path)
+        rms_dbfs = metricas["rms"] if metricas else None
+        try:
+            contador = salvar_srt(iterar_segmentos_filtrados(audio_array, model, stats, rms_dbfs), srt_saida)
+        except Exception as e:
+            print(f"❌ Transcrição falhou: {str(e)[:60]}")
+            contador = 0
+        imprimir_stats(stats)
+        
+        if contador == 0:
+            # Não deixar SRT vazio/parcial para trás (seria pulado como "Já existe")
+            if os.path.exists(srt_saida):
+                os.remove(srt_saida)
             print("❌ Whisper falhou ou nenhum segmento válido")
             return nome_video, False
-        print("✓")
-        
-        print(f"  3️⃣ Salvando SRT...", end=" ", flush=True)
-        contador = salvar_srt(segments, srt_saida)
         print(f"✓ ({contador} legendas)")
         
         return nome_video, True
@@ -303,20 +560,36 @@ def extrair_srt_otimizado(video_path, model):
         print(f"❌ {str(e)[:60]}")
         return nome_video, False
 
-# Carregar modelo uma única vez
-print("⏳ Carregando modelo Whisper...")
-model = WhisperModel(MODELO, device=DEVICE, compute_type=COMPUTE_TYPE, download_root=str(MODELS_DIR))
-print("✅ Modelo carregado!\n")
+@lru_cache(maxsize=1)
+def get_model():
+    """
+    Carrega o modelo Whisper uma única vez (no primeiro uso, não no import).
+    Importar este módulo só pelos utilitários não paga o custo do modelo.
+    """
+    print("⏳ Carregando modelo Whisper...")
+    print(f"   compute_type={COMPUTE_TYPE} | cpu_threads={CPU_THREADS}")
+    model = WhisperModel(
+        MODELO,
+        device=DEVICE,
+        compute_type=COMPUTE_TYPE,
+        cpu_threads=CPU_THREADS,
+        num_workers=1,
+        download_root=str(MODELS_DIR)
+    )
+    print("✅ Modelo carregado!\n")
+    return model
 
 def main():
     os.makedirs(PASTA_SAIDA, exist_ok=True)
     
-    # Listar todos os vídeos
+    # Listar todos os vídeos (maiores primeiro)
+    # Agendamento LPT: o vídeo mais longo começa em t=0 e termina junto com
+    # os demais, em vez de ficar sozinho no fim do lote.
     todos_videos = sorted([
         os.path.join(PASTA_ENTRADA, f) 
         for f in os.listdir(PASTA_ENTRADA) 
         if f.lower().endswith('.mp4')
-    ])
+    ], key=os.path.getsize, reverse=True)
     
     print(f"🎬 Encontrados {len(todos_videos)} vídeos na pasta\n")
     
@@ -346,6 +619,8 @@ def main():
     print(f"   • Detecção de alucinações conhecidas")
     print(f"   • Formatação Netflix (42 chars/linha)\n")
     
+    model = get_model()
+    
     print(f"🚀 Iniciando Pipeline Sequencial (Extrair -> Traduzir -> Embutir)\n")
     
     total_videos = len(videos)
@@ -385,10 +660,8 @@ def main():
             else:
                 print("❌ Falha ao embutir")
         
-        # 4. Cooldown
-        if i < total_videos:
-            print(f"  💤 Aguardando 30s para o próximo vídeo...\n")
-            time.sleep(30)
+        # Sem cooldown fixo: o rate limit do Gemini é tratado dentro de traduzir_srt_gemini
+        print()
     
     print("\n" + "="*70)
     print(f"🏁 Pipeline Finalizado: {sucessos_finais}/{total_videos} vídeos completados!")
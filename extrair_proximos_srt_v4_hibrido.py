@@ -15,12 +15,33 @@ OTIMIZAÇÕES:
 """
 
 import os
+
+# Pools OpenMP/BLAS em 1 thread antes dos imports pesados (ver WHISPER_CPU_THREADS em config.py):
+# aqui o paralelismo fica com o cpu_threads do CTranslate2 e com o pool de blocos
+for _variavel in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+    os.environ.setdefault(_variavel, "1")
+
+import gc
+import importlib.util
+import json
+import queue
+import re
 import subprocess
 import tempfile
+import threading
+from functools import lru_cache
 from pathlib import Path
 import time
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 from faster_whisper import WhisperModel
+from faster_whisper.vad import VadOptions, get_speech_timestamps
+try:
+    from faster_whisper import BatchedInferencePipeline  # faster-whisper >= 1.1
+except ImportError:
+    BatchedInferencePipeline = None
+from utils import format_timestamp
+from srt_writer import write_srt
 from config import SUBTITLES_EN_DIR, SUBTITLES_OUTPUT_DIR, VIDEOS_OUTPUT_DIR, WHISPER_MODEL, MODELS_DIR
 
 # Importar ferramentas do pipeline
@@ -41,12 +62,48 @@ except ImportError:
     print("ℹ️ Stable-TS não instalado. Vídeos longos usarão Faster-Whisper.")
     print("   Para melhor qualidade em vídeos > 45min, instale: pip install stable-ts\n")
 
+def gpu_disponivel():
+    """Detecta GPU CUDA via CTranslate2 (sem precisar importar torch)."""
+    try:
+        import ctranslate2
+        return ctranslate2.get_cuda_device_count() > 0
+    except Exception:
+        return False
+
 # Configurações
 PASTA_ENTRADA = "proximos_para_traducao"
 PASTA_SAIDA = str(SUBTITLES_EN_DIR)
+ARQUIVO_CACHE_DURACAO = Path(PASTA_ENTRADA) / ".durations.json"
 MODELO = WHISPER_MODEL
-DEVICE = "cpu"
-COMPUTE_TYPE = "int8"
+TEM_GPU = gpu_disponivel()
+DEVICE = "cuda" if TEM_GPU else "cpu"
+# GPU: pesos int8 + ativações fp16 (metade dos bytes do float16 puro)
+COMPUTE_TYPE = "int8_float16" if TEM_GPU else "int8"
+TAXA_AMOSTRAGEM = 16000
+TIMEOUT_FFMPEG = 300
+TAMANHO_BLOCO_PIPE = 1 << 20  # 1 MB por leitura do pipe
+THREADS_FFMPEG = 2             # FFmpeg não disputa núcleos com o Whisper
+SILENCIO_RUIDO_DB = -40       # silencedetect: abaixo disso é silêncio...
+SILENCIO_MINIMO = 2           # ...se durar pelo menos 2s
+MARGEM_SILENCIO = 0.25        # s preservados em cada borda do silêncio cortado
+PASTA_SHM = "/dev/shm"        # tmpfs em RAM (Linux); sem ela, usa o pipe
+
+# Configuração para Ryzen 7 3800X (8 Cores / 16 Threads)
+# Usa 12 threads (75%) e deixa 4 para o SO
+THREADS_RYZEN = 12
+# Stable-TS em CPU: 3 processos x 4 threads, cada um com seu modelo
+WORKERS_STABLE = 3
+THREADS_POR_WORKER = THREADS_RYZEN // WORKERS_STABLE
+DURACAO_BLOCO = 300     # ~5 min por bloco, sempre cortado em silêncio
+
+# GPU NVIDIA: Whisper via transformers (bfloat16 + Flash Attention 2), lotes de 30s
+MODELO_FA2 = "openai/whisper-large-v3"
+BATCH_SIZE_FA2 = 24
+
+# Pipeline em estágios (transcrição → tradução → embutir)
+TAMANHO_FILA_ESTAGIOS = 2
+COOLDOWN_GEMINI = 30     # Intervalo mínimo entre chamadas ao Gemini
+TAMANHO_MINIMO_SRT = 100 # Bytes; SRT menor que isso está vazio/corrompido
 
 # Limites de duração (em segundos)
 DURACAO_CURTA = 1200    # 20 minutos (threshold para Stable-TS)
@@ -56,6 +113,8 @@ DURACAO_LONGA = 1200    # 20 minutos (mesmo valor, mantém compatibilidade)
 LIMITE_NO_SPEECH = 0.6
 LIMITE_AVG_LOGPROB = -1.0
 LIMITE_CPS = 25
+DURACAO_MAXIMA_LEGENDA = 7.0  # NENHUMA legenda > 7 segundos
+BATCH_SIZE_WHISPER = 16  # Trechos VAD por lote no encoder (BatchedInferencePipeline)
 
 # Alucinações conhecidas
 ALUCINACOES_COMUNS = [
@@ -66,39 +125,85 @@ ALUCINACOES_COMUNS = [
     "transcribed by", "captioned by",
 ]
 
+# Automato Aho-Corasick: uma passada no texto, independente do nº de frases.
+# Sem pyahocorasick, uma única regex com alternação (também em C).
+try:
+    import ahocorasick
+    _AUTOMATO_ALUCINACOES = ahocorasick.Automaton()
+    for _frase in ALUCINACOES_COMUNS:
+        _AUTOMATO_ALUCINACOES.add_word(_frase, _frase)
+    _AUTOMATO_ALUCINACOES.make_automaton()
+    _REGEX_ALUCINACOES = None
+except ImportError:
+    _AUTOMATO_ALUCINACOES = None
+    _REGEX_ALUCINACOES = re.compile("|".join(map(re.escape, ALUCINACOES_COMUNS)))
+
 def eh_alucinacao_conhecida(texto):
     """Detecta frases comuns que o Whisper inventa em silêncios."""
-    texto_lower = texto.lower().strip()
-    return any(alu in texto_lower for alu in ALUCINACOES_COMUNS)
+    texto_lower = texto.lower()
+    if _AUTOMATO_ALUCINACOES is not None:
+        return next(_AUTOMATO_ALUCINACOES.iter(texto_lower), None) is not None
+    return _REGEX_ALUCINACOES.search(texto_lower) is not None
+
+# Empacotador guloso de linhas: o loop palavra-a-palavra roda dentro do motor de regex (C)
+_WRAP_RE = re.compile(r'\S{43,}\s*|.{1,42}(?:\s+|$)')
+
+@lru_cache(maxsize=8)
+def _padrao_quebra(max_chars):
+    """Regex de quebra para um limite de caracteres (42 já vem pré-compilado)."""
+    if max_chars == 42:
+        return _WRAP_RE
+    return re.compile(rf'\S{{{max_chars + 1},}}\s*|.{{1,{max_chars}}}(?:\s+|$)')
 
 def quebrar_legenda_netflix(texto, max_chars=42, max_linhas=2):
     """Quebra texto seguindo padrão Netflix de legendagem (max 42 chars/linha, 2 linhas)."""
-    texto = texto.replace('\n', ' ').strip()
-    palavras = texto.split()
-    linhas = []
-    linha_atual = ""
-    
-    for palavra in palavras:
-        teste = f"{linha_atual} {palavra}".strip()
-        if len(teste) <= max_chars:
-            linha_atual = teste
-        else:
-            if linha_atual:
-                linhas.append(linha_atual)
-            linha_atual = palavra
-    
-    if linha_atual:
-        linhas.append(linha_atual)
-    
-    return "\n".join(linhas[:max_linhas])
+    texto = " ".join(texto.split())
+    linhas = _padrao_quebra(max_chars).findall(texto)[:max_linhas]
+    return "\n".join(linha.strip() for linha in linhas if linha)
+
+# Durações já medidas: {"caminho:mtime:tamanho": segundos}
+_cache_duracao = {}
+_trava_cache_duracao = threading.Lock()
+
+def carregar_cache_duracao():
+    """Carrega o cache de durações (sidecar JSON na pasta de entrada)."""
+    try:
+        with open(ARQUIVO_CACHE_DURACAO, 'r', encoding='utf-8') as f:
+            _cache_duracao.update(json.load(f))
+    except (OSError, ValueError):
+        pass
+
+def salvar_cache_duracao():
+    """
+    Grava o cache de durações de forma atômica (tmp + os.replace): uma interrupção
+    no meio nunca deixa um JSON truncado. Falhar aqui só custa um ffprobe na próxima vez.
+    """
+    temporario = ARQUIVO_CACHE_DURACAO.with_name(ARQUIVO_CACHE_DURACAO.name + ".tmp")
+    with _trava_cache_duracao:
+        try:
+            with open(temporario, 'w', encoding='utf-8') as f:
+                json.dump(_cache_duracao, f)
+            os.replace(temporario, ARQUIVO_CACHE_DURACAO)
+        except OSError as e:
+            print(f"    ⚠️ Cache de durações não gravado: {e}")
 
 def obter_duracao_video(video_path):
     """
     Obtém a duração do vídeo em segundos usando ffprobe.
+    Memoizada por (caminho, mtime, tamanho): cada vídeo só é sondado uma vez.
     
     Returns:
         float: Duração em segundos, ou None se falhar
     """
+    try:
+        info = os.stat(video_path)
+    except OSError as e:
+        print(f"    ⚠️ Erro ao obter duração: {e}")
+        return None
+    chave = f"{video_path}:{info.st_mtime}:{info.st_size}"
+    if chave in _cache_duracao:
+        return _cache_duracao[chave]
+    
     try:
         cmd = [
             'ffprobe',
@@ -109,162 +214,534 @@ def obter_duracao_video(video_path):
         ]
         
         result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-        if result.returncode == 0 and result.stdout.strip():
-            return float(result.stdout.strip())
-        return None
-        
+        if result.returncode != 0 or not result.stdout.strip():
+            return None
+        duracao = float(result.stdout.strip())
     except Exception as e:
         print(f"    ⚠️ Erro ao obter duração: {e}")
         return None
+    
+    # Fora do try: erro ao gravar o cache não descarta a duração já medida
+    with _trava_cache_duracao:
+        _cache_duracao[chave] = duracao
+    salvar_cache_duracao()
+    return duracao
 
-def carregar_audio_via_pipe(video_path):
+def ler_pcm_float32(stream, amostras_estimadas):
     """
-    Usa FFmpeg para extrair, normalizar e enviar o áudio diretamente para a memória (Pipe).
+    Lê PCM s16le do pipe em blocos de 1 MB e já converte para float32 normalizado,
+    escrevendo direto no array pré-alocado (cast + escala numa única passada).
+    """
+    saida = np.empty(max(amostras_estimadas, 1), dtype=np.float32)
+    buffer = bytearray(TAMANHO_BLOCO_PIPE)
+    visao = memoryview(buffer)
+    escala = np.float32(1 / 32768.0)
+    preenchido = 0
+    pendente = 0  # Byte ímpar que sobrou da leitura anterior
+    
+    while True:
+        lidos = stream.readinto(visao[pendente:])
+        if not lidos:
+            break
+        total = pendente + lidos
+        n = total // 2
+        if preenchido + n > len(saida):
+            # Duração estimada curta demais: dobra a capacidade
+            maior = np.empty(max(len(saida) * 2, preenchido + n), dtype=np.float32)
+            maior[:preenchido] = saida[:preenchido]
+            saida = maior
+        np.multiply(
+            np.frombuffer(buffer, dtype=np.int16, count=n), escala,
+            out=saida[preenchido:preenchido + n], dtype=np.float32, casting='unsafe'
+        )
+        preenchido += n
+        pendente = total % 2
+        if pendente:
+            buffer[0] = buffer[total - 1]
+    
+    return saida[:preenchido]
+
+def comando_ffmpeg_audio(video_path, destino):
+    """
+    Monta o comando FFmpeg que extrai e normaliza o áudio (PCM s16le 16kHz mono).
+    O silencedetect roda na mesma passada (antes da normalização) e loga no stderr.
     """
     filtro_reforçado = (
+        f"silencedetect=noise={SILENCIO_RUIDO_DB}dB:d={SILENCIO_MINIMO},"
         "afftdn=nr=20:nf=-30,"
         "dynaudnorm=f=75:g=31:p=0.95:m=10,"
         "highpass=f=200,"
         "lowpass=f=3000"
     )
     
-    comando = [
+    return [
         "ffmpeg",
+        "-y",
+        "-hide_banner",
+        "-nostats",
+        "-filter_threads", str(THREADS_FFMPEG),
         "-i", video_path,
         "-af", filtro_reforçado,
-        "-ar", "16000",
+        "-ar", str(TAXA_AMOSTRAGEM),
         "-ac", "1",
         "-f", "s16le",
         "-vn",
-        "-"
+        "-threads", str(THREADS_FFMPEG),
+        destino
     ]
+
+def carregar_audio_via_shm(video_path):
+    """
+    FFmpeg grava o PCM num arquivo em /dev/shm (RAM) e o NumPy o mapeia com memmap:
+    o áudio decodificado não passa pelo pipe nem vira um objeto bytes.
     
+    Returns:
+        tuple: (audio_array, log do FFmpeg) ou (None, "")
+    """
+    caminho_raw = os.path.join(PASTA_SHM, f"aud_{os.getpid()}.raw")
+    try:
+        resultado = subprocess.run(
+            comando_ffmpeg_audio(video_path, caminho_raw),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            timeout=TIMEOUT_FFMPEG
+        )
+        if resultado.returncode != 0 or os.path.getsize(caminho_raw) == 0:
+            return None, ""
+        
+        pcm = np.memmap(caminho_raw, dtype=np.int16, mode='r')
+        audio_array = np.empty(len(pcm), dtype=np.float32)
+        np.multiply(pcm, np.float32(1 / 32768.0), out=audio_array, dtype=np.float32, casting='unsafe')
+        del pcm
+        return audio_array, resultado.stderr.decode('utf-8', errors='replace')
+        
+    except subprocess.TimeoutExpired:
+        return None, ""
+    except Exception as e:
+        print(f"    ⚠️ Erro no shm: {str(e)[:50]}")
+        return None, ""
+    finally:
+        if os.path.exists(caminho_raw):
+            os.unlink(caminho_raw)
+
+def carregar_audio_via_pipe(video_path, duracao=None):
+    """
+    Usa FFmpeg para extrair, normalizar e enviar o áudio diretamente para a memória (Pipe).
+    No Linux prefere /dev/shm + memmap (uma cópia a menos).
+    
+    Returns:
+        tuple: (audio_array, log do FFmpeg) ou (None, "")
+    """
+    if os.path.isdir(PASTA_SHM):
+        return carregar_audio_via_shm(video_path)
+    
+    comando = comando_ffmpeg_audio(video_path, "-")
+    
+    if duracao is None:
+        duracao = obter_duracao_video(video_path) or 0
+    
+    processo = None
     try:
         processo = subprocess.Popen(
             comando,
             stdout=subprocess.PIPE,
-            stderr=subprocess.DEVNULL,
-            bufsize=10**7
+            stderr=subprocess.PIPE,
+            bufsize=0
         )
         
-        dados_raw, _ = processo.communicate(timeout=300)
+        # Thread drena o stderr (log do silencedetect) para o pipe não travar
+        linhas_log = []
+        leitor_log = threading.Thread(target=lambda: linhas_log.extend(processo.stderr), daemon=True)
+        leitor_log.start()
         
-        if processo.returncode != 0 or len(dados_raw) == 0:
-            return None
+        # Watchdog: mata o FFmpeg se passar do timeout
+        vigia = threading.Timer(TIMEOUT_FFMPEG, processo.kill)
+        vigia.start()
+        try:
+            audio_array = ler_pcm_float32(processo.stdout, int(duracao * TAXA_AMOSTRAGEM))
+            processo.wait()
+            leitor_log.join()
+        finally:
+            vigia.cancel()
         
-        audio_array = np.frombuffer(dados_raw, np.int16).flatten().astype(np.float32) / 32768.0
-        return audio_array
+        if processo.returncode != 0 or len(audio_array) == 0:
+            return None, ""
+        
+        return audio_array, b"".join(linhas_log).decode('utf-8', errors='replace')
         
-    except subprocess.TimeoutExpired:
-        processo.kill()
-        return None
     except Exception as e:
+        if processo is not None:
+            processo.kill()
         print(f"    ⚠️ Erro no pipe: {str(e)[:50]}")
+        return None, ""
+
+_RE_SILENCIO = re.compile(r"silence_(start|end): (-?[\d.]+)")
+
+def extrair_silencios(log_ffmpeg, duracao_total):
+    """Lê os intervalos (início, fim) de silêncio do log do silencedetect."""
+    silencios = []
+    inicio = None
+    for tipo, valor in _RE_SILENCIO.findall(log_ffmpeg):
+        if tipo == "start":
+            inicio = max(0.0, float(valor))
+        elif inicio is not None:
+            silencios.append((inicio, float(valor)))
+            inicio = None
+    if inicio is not None:
+        silencios.append((inicio, duracao_total))  # Silêncio até o fim do arquivo
+    return silencios
+
+def remover_silencios(audio, silencios):
+    """
+    Corta do áudio os silêncios longos (mantendo uma margem nas bordas).
+    
+    Returns:
+        tuple: (audio_compacto, mapa) onde mapa = (inícios compactos, inícios originais)
+               de cada trecho mantido, em segundos, para remapear_tempos()
+    """
+    duracao = len(audio) / TAXA_AMOSTRAGEM
+    trechos = []
+    cursor = 0.0
+    for inicio, fim in silencios:
+        corte_inicio = inicio + MARGEM_SILENCIO
+        corte_fim = fim - MARGEM_SILENCIO
+        if corte_fim <= corte_inicio:
+            continue
+        if corte_inicio > cursor:
+            trechos.append((cursor, corte_inicio))
+        cursor = max(cursor, corte_fim)
+    if cursor < duracao:
+        trechos.append((cursor, duracao))
+    
+    if not trechos or len(trechos) == 1 and trechos[0] == (0.0, duracao):
+        return audio, (np.zeros(1), np.zeros(1))
+    
+    amostras = [(int(a * TAXA_AMOSTRAGEM), int(b * TAXA_AMOSTRAGEM)) for a, b in trechos]
+    audio_compacto = np.concatenate([audio[a:b] for a, b in amostras])
+    tamanhos = np.array([b - a for a, b in amostras])
+    inicios_compactos = np.concatenate(([0], np.cumsum(tamanhos)[:-1])) / TAXA_AMOSTRAGEM
+    inicios_originais = np.array([a for a, _ in amostras]) / TAXA_AMOSTRAGEM
+    return audio_compacto, (inicios_compactos, inicios_originais)
+
+def remapear_tempos(tempos, mapa, fim=False):
+    """
+    Converte tempos do áudio compacto de volta para o tempo do vídeo.
+    Fins exatamente numa emenda ficam no trecho anterior; inícios, no seguinte.
+    """
+    inicios_compactos, inicios_originais = mapa
+    tempos = np.asarray(tempos, dtype=np.float64)
+    indices = np.searchsorted(inicios_compactos, tempos, side='left' if fim else 'right') - 1
+    indices = np.clip(indices, 0, len(inicios_compactos) - 1)
+    return tempos - inicios_compactos[indices] + inicios_originais[indices]
+
+def carregar_audio_compacto(video_path, duracao=None):
+    """
+    Decodifica o áudio (uma passada do FFmpeg) e remove os silêncios longos
+    que o silencedetect encontrou, para o Whisper não gastar tempo com eles.
+    
+    Returns:
+        tuple: (audio_compacto, mapa) ou (None, None)
+    """
+    audio_array, log_ffmpeg = carregar_audio_via_pipe(video_path, duracao)
+    if audio_array is None:
+        return None, None
+    
+    silencios = extrair_silencios(log_ffmpeg, len(audio_array) / TAXA_AMOSTRAGEM)
+    audio_compacto, mapa = remover_silencios(audio_array, silencios)
+    cortado = (len(audio_array) - len(audio_compacto)) / TAXA_AMOSTRAGEM
+    if cortado >= 1:
+        print(f"(✂️ {int(cortado)}s de silêncio)", end=" ", flush=True)
+    return audio_compacto, mapa
+
+# Parâmetros comuns do Stable-TS (sequencial e workers)
+PARAMETROS_STABLE = dict(
+    language="en",
+    vad=True,
+    vad_threshold=0.3,  # ↓ Baixamos de 0.5 para 0.3 (Modo Sensível para sussurros)
+    vad_parameters=dict(
+        min_silence_duration_ms=500,  # Corta se houver 0.5s de silêncio
+        speech_pad_ms=200             # Margem pequena nas pontas
+    ),
+    regroup=True,
+    word_timestamps=True,
+)
+
+def refinar_resultado_stable(result):
+    """
+    Travão de Mão Anti-Chiclete (parte que precisa das palavras): quebra por buracos.
+    Limite de duração e remoção de vazios ficam em travao_vetorizado().
+    """
+    # Verifica se o método existe antes de usar (defensive programming)
+    if hasattr(result, 'split_by_gap'):
+        result.split_by_gap(0.5)  # Força quebra se houver buraco > 0.5s
+
+def segmentos_para_arrays(segments, deslocamento=0.0):
+    """Extrai (inícios, fins, textos) dos segmentos do Stable-TS em arrays paralelos."""
+    inicios = np.fromiter((seg.start for seg in segments), dtype=np.float64) + deslocamento
+    fins = np.fromiter((seg.end for seg in segments), dtype=np.float64) + deslocamento
+    textos = np.array([seg.text.strip() for seg in segments], dtype=object)
+    return inicios, fins, textos
+
+def travao_vetorizado(inicios, fins, textos):
+    """
+    Travão de Mão Anti-Chiclete em NumPy: ordena, limita a duração máxima
+    e descarta legendas vazias/invertidas, tudo com máscaras vetorizadas.
+    """
+    ordem = np.argsort(inicios, kind='stable')
+    inicios, fins, textos = inicios[ordem], fins[ordem], textos[ordem]
+    fins = np.minimum(fins, inicios + DURACAO_MAXIMA_LEGENDA)
+    manter = (textos != "") & (fins > inicios)
+    return inicios[manter], fins[manter], textos[manter]
+
+def dividir_em_blocos(audio, duracao_bloco=DURACAO_BLOCO):
+    """
+    Divide o áudio em blocos de ~duracao_bloco segundos cortando só em silêncios.
+    Usa o Silero VAD embutido no faster-whisper para achar as pausas.
+    
+    Returns:
+        list: [(inicio, fim)] em amostras
+    """
+    alvo = duracao_bloco * TAXA_AMOSTRAGEM
+    if len(audio) <= alvo:
+        return [(0, len(audio))]
+    
+    trechos = get_speech_timestamps(audio, VadOptions(min_silence_duration_ms=500))
+    cortes = [0]
+    for atual, proximo in zip(trechos, trechos[1:]):
+        meio_pausa = (atual["end"] + proximo["start"]) // 2
+        if meio_pausa - cortes[-1] >= alvo:
+            cortes.append(meio_pausa)
+    cortes.append(len(audio))
+    return list(zip(cortes, cortes[1:]))
+
+@lru_cache(maxsize=2)
+def _get_stable_model(device, compute_type, model_name, threads):
+    """Carrega o Stable-TS (motor Faster-Whisper) uma vez e reaproveita entre vídeos."""
+    print("    ⚙️ Carregando Stable-TS + Faster-Whisper...", end=" ", flush=True)
+    model = stable_whisper.load_faster_whisper(
+        model_name,
+        device=device,
+        compute_type=compute_type,
+        cpu_threads=threads,
+        download_root=str(MODELS_DIR)
+    )
+    print("✓")
+    return model
+
+@lru_cache(maxsize=1)
+def _get_pipeline_fa2():
+    """Pipeline ASR do transformers em bfloat16; Flash Attention 2 se flash-attn estiver instalado."""
+    import torch
+    from transformers import pipeline
+    
+    atencao = "flash_attention_2" if importlib.util.find_spec("flash_attn") else "sdpa"
+    print(f"    ⚙️ Carregando {MODELO_FA2} ({atencao}, bfloat16)...", end=" ", flush=True)
+    pipe = pipeline(
+        "automatic-speech-recognition",
+        model=MODELO_FA2,
+        torch_dtype=torch.bfloat16,
+        model_kwargs={"attn_implementation": atencao},
+        device="cuda",
+    )
+    print("✓")
+    return pipe
+
+def transcrever_gpu_fa2(audio, mapa, srt_output):
+    """
+    Caminho GPU estilo insanely-fast-whisper: trechos de 30s em lote no encoder.
+    
+    Returns:
+        int: Legendas gravadas, ou None se transformers/GPU não estiverem disponíveis
+    """
+    try:
+        pipe = _get_pipeline_fa2()
+    except Exception as e:
+        print(f"    ℹ️ Caminho FA2 indisponível ({str(e)[:40]}), usando Stable-TS")
         return None
+    
+    print("    🧠 Transcrevendo (GPU, lotes)...", end=" ", flush=True)
+    saida = None
+    try:
+        saida = pipe(
+            {"raw": audio, "sampling_rate": TAXA_AMOSTRAGEM},
+            chunk_length_s=30,
+            batch_size=BATCH_SIZE_FA2,
+            return_timestamps=True,
+            generate_kwargs={"language": "en"},
+        )
+    except Exception as e:
+        print(f"⚠️ FA2 falhou ({str(e)[:40]}), usando Stable-TS")
+    if saida is None:
+        # OOM/CUDA no meio da inferência: solta o pipeline e a VRAM antes do Stable-TS carregar
+        del pipe
+        _get_pipeline_fa2.cache_clear()
+        gc.collect()
+        import torch
+        torch.cuda.empty_cache()
+        return None
+    print("✓")
+    
+    duracao = len(audio) / TAXA_AMOSTRAGEM
+    trechos = saida.get("chunks", [])
+    inicios = np.array([trecho["timestamp"][0] or 0.0 for trecho in trechos], dtype=np.float64)
+    fins = np.array([
+        trecho["timestamp"][1] if trecho["timestamp"][1] is not None else duracao
+        for trecho in trechos
+    ], dtype=np.float64)
+    textos = np.array([trecho["text"].strip() for trecho in trechos], dtype=object)
+    
+    inicios, fins, textos = travao_vetorizado(
+        remapear_tempos(inicios, mapa), remapear_tempos(fins, mapa, fim=True), textos
+    )
+    return salvar_srt(inicios, fins, textos, srt_output)
+
+_modelo_worker = None
+
+def _iniciar_worker_stable(modelo, compute_type, threads):
+    """Initializer do pool: cada processo carrega seu próprio modelo uma vez."""
+    global _modelo_worker
+    _modelo_worker = stable_whisper.load_faster_whisper(
+        modelo,
+        device="cpu",
+        compute_type=compute_type,
+        cpu_threads=threads,
+        download_root=str(MODELS_DIR)
+    )
+
+def _transcrever_bloco(audio_bloco, deslocamento):
+    """Transcreve um bloco no worker e devolve arrays já no tempo do vídeo."""
+    result = _modelo_worker.transcribe(audio_bloco, **PARAMETROS_STABLE)
+    try:
+        refinar_resultado_stable(result)
+    except Exception:
+        pass  # Mantém a versão base do bloco
+    return segmentos_para_arrays(result.segments, deslocamento)
+
+_pool_stable = None
 
-def format_timestamp(seconds):
-    """Converte segundos para formato SRT HH:MM:SS,mmm"""
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
-    millis = int((seconds % 1) * 1000)
-    return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
+def _obter_pool_stable(modelo, compute_type):
+    """
+    Cria o ProcessPool do Stable-TS no primeiro vídeo longo e o reaproveita nos seguintes:
+    cada worker carrega o modelo uma única vez por execução, não uma vez por vídeo.
+    """
+    global _pool_stable
+    if _pool_stable is None:
+        _pool_stable = ProcessPoolExecutor(
+            max_workers=WORKERS_STABLE,
+            initializer=_iniciar_worker_stable,
+            initargs=(modelo, compute_type, THREADS_POR_WORKER),
+        )
+    return _pool_stable
+
+def encerrar_pool_stable():
+    """Encerra o ProcessPool do Stable-TS (se chegou a ser criado)."""
+    global _pool_stable
+    if _pool_stable is not None:
+        _pool_stable.shutdown()
+        _pool_stable = None
+
+def transcrever_blocos_paralelo(audio, mapa, blocos, modelo, compute_type, srt_output):
+    """Transcreve blocos em paralelo (ProcessPool) e grava um único SRT ordenado."""
+    print(f"    🧩 {len(blocos)} blocos em {WORKERS_STABLE} processos "
+          f"x {THREADS_POR_WORKER} threads...", end=" ", flush=True)
+    executor = _obter_pool_stable(modelo, compute_type)
+    futuros = [
+        executor.submit(_transcrever_bloco, audio[inicio:fim], inicio / TAXA_AMOSTRAGEM)
+        for inicio, fim in blocos
+    ]
+    partes = [futuro.result() for futuro in futuros]
+    print("✓")
+    
+    inicios, fins, textos = (np.concatenate(coluna) for coluna in zip(*partes))
+    inicios = remapear_tempos(inicios, mapa)
+    fins = remapear_tempos(fins, mapa, fim=True)
+    inicios, fins, textos = travao_vetorizado(inicios, fins, textos)
+    print("    💾 Salvando SRT...", end=" ", flush=True)
+    contador = salvar_srt(inicios, fins, textos, srt_output)
+    print("✓")
+    return contador
 
 def transcrever_com_stable_ts(video_path, srt_output):
     """
     Transcreve usando Stable-TS para vídeos longos.
     ANTI-CHICLETE: VAD agressivo + limitação de duração máxima.
-    TURBO RYZEN: Otimizado para Ryzen 7 3800X (12 threads).
+    TURBO RYZEN: Em CPU, blocos de ~5min em paralelo (3 processos x 4 threads).
     BLINDADO: Salva SRT imediatamente após transcrição (nunca perde trabalho).
     """
     if not STABLE_TS_AVAILABLE:
         return None
     
     try:
-        import torch
-        
         # --- DETECÇÃO DE HARDWARE ---
-        tem_nvidia = torch.cuda.is_available()
-        
-        # Configuração para Ryzen 7 3800X (8 Cores / 16 Threads)
-        # Usa 12 threads (75%) e deixa 4 para o SO
-        THREADS_RYZEN = 12
+        tem_nvidia = TEM_GPU
         
         if tem_nvidia:
             device = "cuda"
             modelo_usar = MODELO  # Usa o configurado (large-v3)
-            compute_type = "float16"
+            compute_type = "int8_float16"
             threads = 4  # GPU não precisa de muitos threads CPU
             print("    🚀 GPU NVIDIA detectada! Modo Turbo Ativado.")
         else:
             device = "cpu"
             # Modelo 'medium' é ideal para CPU (rápido e preciso)
-            # 'large-v3' seria 4x mais lento
+            # 'large-v3' em int8 seria 4x mais lento
             modelo_usar = "medium"
             compute_type = "int8"  # Obrigatório para velocidade em CPU
             threads = THREADS_RYZEN
             print(f"    🦁 Processador Ryzen detectado!")
-            print(f"    🔥 MODO TURBO CPU: {threads} threads (Modelo: {modelo_usar} - int8)")
-        
-        # Carregar modelo usando Faster-Whisper como motor (MUITO mais rápido)
-        print("    ⚙️ Carregando Stable-TS + Faster-Whisper...", end=" ", flush=True)
-        model = stable_whisper.load_faster_whisper(
-            modelo_usar,
-            device=device,
-            compute_type=compute_type,
-            cpu_threads=threads,
-            download_root=str(MODELS_DIR)
-        )
-        print("✓")
+            print(f"    🔥 MODO TURBO CPU: {threads} threads (Modelo: {modelo_usar} - {compute_type})")
         
         # Obter áudio
         print("    🎙️ Extraindo áudio...", end=" ", flush=True)
-        audio = carregar_audio_via_pipe(video_path)
+        audio, mapa = carregar_audio_compacto(video_path)
         if audio is None:
             return None
         print("✓")
         
+        # GPU: tenta o caminho transformers + Flash Attention 2 (lotes de 30s)
+        if tem_nvidia:
+            contador = transcrever_gpu_fa2(audio, mapa, srt_output)
+            if contador is not None:
+                return contador
+        
+        # CPU: áudio longo vira blocos independentes (um modelo por processo)
+        if not tem_nvidia:
+            blocos = dividir_em_blocos(audio)
+            if len(blocos) > 1:
+                return transcrever_blocos_paralelo(audio, mapa, blocos, modelo_usar, compute_type, srt_output)
+        
+        # Carregar modelo usando Faster-Whisper como motor (MUITO mais rápido)
+        # Cacheado: só o primeiro vídeo longo paga o carregamento
+        model = _get_stable_model(device, compute_type, modelo_usar, threads)
+        
         # Transcrever com Stable-TS (VAD Agressivo)
         # CORREÇÃO: Usar .transcribe() em vez de .transcribe_stable() (deprecated)
         print("    🧠 Transcrevendo (ventoinhas vão acelerar!)...", end=" ", flush=True)
-        result = model.transcribe(
-            audio,
-            language="en",
-            vad=True,
-            vad_threshold=0.3,  # ↓ Baixamos de 0.5 para 0.3 (Modo Sensível para sussurros)
-            vad_parameters=dict(
-                min_silence_duration_ms=500,  # Corta se houver 0.5s de silêncio
-                speech_pad_ms=200             # Margem pequena nas pontas
-            ),
-            regroup=True,
-            word_timestamps=True,
-        )
+        result = model.transcribe(audio, **PARAMETROS_STABLE)
         print("✓")
         
         # --- SALVAMENTO DE SEGURANÇA (CRÍTICO!) ---
         # Salva IMEDIATAMENTE antes de tentar qualquer otimização
         # Isso garante que nunca perdemos 45+ minutos de trabalho
         print("    💾 Salvando versão base...", end=" ", flush=True)
-        result.to_srt_vtt(srt_output, word_level=False)
+        inicios, fins, textos = segmentos_para_arrays(result.segments)
+        salvar_srt(remapear_tempos(inicios, mapa), remapear_tempos(fins, mapa, fim=True), textos, srt_output)
         print("✓")
         
         # --- PÓS-PROCESSAMENTO: "Travão de Mão" Anti-Chiclete (OPCIONAL) ---
         # Se falhar aqui, não tem problema - já salvamos o SRT base
         print("    ✂️ Refinando durações (Anti-Chiclete)...", end=" ", flush=True)
         try:
-            # Verifica se os métodos existem antes de usar (defensive programming)
-            if hasattr(result, 'clamp_max_duration'):
-                result.clamp_max_duration(7.0)  # NENHUMA legenda > 7 segundos
-            
-            if hasattr(result, 'split_by_gap'):
-                result.split_by_gap(0.5)  # Força quebra se houver buraco > 0.5s
-                
-            if hasattr(result, 'remove_all_empty'):
-                result.remove_all_empty()  # Remove legendas vazias
+            refinar_resultado_stable(result)
+            inicios, fins, textos = segmentos_para_arrays(result.segments)
+            inicios, fins, textos = travao_vetorizado(
+                remapear_tempos(inicios, mapa), remapear_tempos(fins, mapa, fim=True), textos
+            )
             
             # Se conseguiu otimizar, sobrescreve com versão melhorada
-            result.to_srt_vtt(srt_output, word_level=False)
+            contador = salvar_srt(inicios, fins, textos, srt_output)
             print("✓ (otimizado)")
+            return contador
             
         except Exception as e_opt:
             # Não falha - apenas avisa e mantém a versão base
@@ -276,11 +753,21 @@ def transcrever_com_stable_ts(video_path, srt_output):
         print(f"    ❌ Stable-TS falhou: {str(e)[:60]}")
         return None
 
-def transcrever_audio_otimizado(audio_array, model):
+def transcrever_e_salvar(audio_array, model, output_path, mapa):
     """
-    Transcreve áudio com filtros de confiança integrados (Faster-Whisper).
+    Transcreve áudio com filtros de confiança integrados (Faster-Whisper) e grava
+    cada segmento aprovado no SRT assim que sai do gerador (sem lista intermediária).
+    Aceita WhisperModel ou BatchedInferencePipeline (trechos VAD em lote).
+    Os tempos são remapeados (mapa de remover_silencios) para o tempo do vídeo.
+    
+    Returns:
+        int: Legendas gravadas (0 = nada aprovado, SRT removido), ou None se falhar
     """
     try:
+        opcoes_lote = {}
+        if BatchedInferencePipeline is not None and isinstance(model, BatchedInferencePipeline):
+            opcoes_lote["batch_size"] = BATCH_SIZE_WHISPER
+        
         vad_parameters = {
             "threshold": 0.5,
             "min_speech_duration_ms": 250,
@@ -290,7 +777,8 @@ def transcrever_audio_otimizado(audio_array, model):
         segments, info = model.transcribe(
             audio_array,
             language="en",
-            beam_size=5,
+            beam_size=1,  # Greedy: segmentos já passam por filtros de confiança
+            best_of=1,
             without_timestamps=False,
             condition_on_previous_text=False,
             vad_filter=True,
@@ -298,10 +786,10 @@ def transcrever_audio_otimizado(audio_array, model):
             no_speech_threshold=0.4,
             log_prob_threshold=-0.9,
             compression_ratio_threshold=2.4,
-            word_timestamps=True,
+            word_timestamps=False,  # SRT usa só tempos de segmento (sem passada DTW extra)
+            **opcoes_lote,
         )
         
-        segmentos_filtrados = []
         stats = {
             'total': 0,
             'no_speech': 0,
@@ -310,28 +798,28 @@ def transcrever_audio_otimizado(audio_array, model):
             'aprovados': 0
         }
         
-        for segment in segments:
-            stats['total'] += 1
-            
-            if segment.no_speech_prob > LIMITE_NO_SPEECH:
-                stats['no_speech'] += 1
-                continue
-            
-            if segment.avg_logprob < LIMITE_AVG_LOGPROB:
-                stats['low_prob'] += 1
-                continue
-            
-            texto = segment.text.strip()
-            if eh_alucinacao_conhecida(texto):
-                stats['alucinacao'] += 1
-                continue
-            
-            stats['aprovados'] += 1
-            segmentos_filtrados.append({
-                'start': segment.start,
-                'end': segment.end,
-                'text': texto,
-            })
+        with open(output_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            for segment in segments:
+                stats['total'] += 1
+                
+                if segment.no_speech_prob > LIMITE_NO_SPEECH:
+                    stats['no_speech'] += 1
+                    continue
+                
+                if segment.avg_logprob < LIMITE_AVG_LOGPROB:
+                    stats['low_prob'] += 1
+                    continue
+                
+                texto = segment.text.strip()
+                if eh_alucinacao_conhecida(texto):
+                    stats['alucinacao'] += 1
+                    continue
+                
+                stats['aprovados'] += 1
+                texto = quebrar_legenda_netflix(texto, max_chars=42, max_linhas=2)
+                start = format_timestamp(float(remapear_tempos(segment.start, mapa)))
+                end = format_timestamp(float(remapear_tempos(segment.end, mapa, fim=True)))
+                f.write(f"{stats['aprovados']}\n{start} --> {end}\n{texto}\n\n")
         
         if stats['total'] > 0:
             filtrados = stats['no_speech'] + stats['low_prob'] + stats['alucinacao']
@@ -340,23 +828,24 @@ def transcrever_audio_otimizado(audio_array, model):
                       f"{stats['low_prob']} baixa conf., {stats['alucinacao']} aluc.)", 
                       end=" ", flush=True)
         
-        return segmentos_filtrados
+        if stats['aprovados'] == 0:
+            os.remove(output_path)
+        return stats['aprovados']
         
     except Exception as e:
         print(f"    ❌ Transcrição falhou: {str(e)[:60]}")
+        # Não deixa SRT parcial para trás (senão o vídeo seria pulado como "já existe")
+        if os.path.exists(output_path):
+            os.remove(output_path)
         return None
 
-def salvar_srt(segments, output_path):
-    """Salva segmentos em SRT com formatação Netflix"""
-    contador = 0
-    with open(output_path, 'w', encoding='utf-8') as f:
-        for segment in segments:
-            texto = quebrar_legenda_netflix(segment['text'], max_chars=42, max_linhas=2)
-            contador += 1
-            start = format_timestamp(segment['start'])
-            end = format_timestamp(segment['end'])
-            f.write(f"{contador}\n{start} --> {end}\n{texto}\n\n")
-    return contador
+def salvar_srt(inicios, fins, textos, output_path):
+    """Salva arrays (já filtrados) em SRT com formatação Netflix"""
+    textos_netflix = (
+        quebrar_legenda_netflix(texto, max_chars=42, max_linhas=2)
+        for texto in textos.tolist()
+    )
+    return write_srt(output_path, zip(inicios.tolist(), fins.tolist(), textos_netflix))
 
 def extrair_srt_hibrido(video_path, model_faster):
     """
@@ -402,17 +891,16 @@ def extrair_srt_hibrido(video_path, model_faster):
         
         if metodo == "faster":
             print(f"processando...", end=" ", flush=True)
-            audio_array = carregar_audio_via_pipe(video_path)
+            audio_array, mapa = carregar_audio_compacto(video_path, duracao)
             if audio_array is None:
                 print("❌ FFmpeg falhou")
                 return nome_video, False
             
-            segments = transcrever_audio_otimizado(audio_array, model_faster)
-            if segments is None or len(segments) == 0:
+            contador = transcrever_e_salvar(audio_array, model_faster, srt_saida, mapa)
+            if not contador:
                 print("❌ Whisper falhou")
                 return nome_video, False
             
-            contador = salvar_srt(segments, srt_saida)
             print(f"✓ ({contador} legendas)")
         
         return nome_video, True
@@ -421,28 +909,109 @@ def extrair_srt_hibrido(video_path, model_faster):
         print(f"❌ {str(e)[:60]}")
         return nome_video, False
 
-# Carregar modelo Faster-Whisper uma única vez
-print("⏳ Carregando modelo Faster-Whisper...")
-model_faster = WhisperModel(MODELO, device=DEVICE, compute_type=COMPUTE_TYPE, download_root=str(MODELS_DIR))
-print("✅ Modelo carregado!\n")
+def carregar_modelo_faster():
+    """
+    Carrega o Faster-Whisper direto do cache local (sem consultar o Hub)
+    e aquece o encoder com 1s de silêncio: o primeiro vídeo já roda na velocidade normal.
+    """
+    opcoes = dict(
+        device=DEVICE,
+        compute_type=COMPUTE_TYPE,
+        cpu_threads=THREADS_RYZEN,
+        num_workers=1,
+        download_root=str(MODELS_DIR)
+    )
+    try:
+        model = WhisperModel(MODELO, local_files_only=True, **opcoes)
+    except Exception:
+        # Primeira execução: modelo ainda não está em MODELS_DIR
+        model = WhisperModel(MODELO, **opcoes)
+    
+    segmentos, _ = model.transcribe(
+        np.zeros(TAXA_AMOSTRAGEM, dtype=np.float32), language="en", beam_size=1
+    )
+    list(segmentos)
+    return model
+
+def estagio_traducao(fila_traducao, fila_embed):
+    """
+    Thread do estágio 2: traduz com Gemini os SRTs já extraídos.
+    Rede pura, roda em paralelo com a transcrição do próximo vídeo.
+    """
+    ultima_chamada_gemini = None
+    while True:
+        item = fila_traducao.get()
+        if item is None:
+            fila_embed.put(None)
+            return
+        video, nome_video, srt_en_path = item
+        
+        # Cooldown só pelo tempo que falta desde a última chamada real ao Gemini
+        # (a transcrição do vídeo seguinte normalmente já consumiu esse tempo)
+        if ultima_chamada_gemini is not None:
+            espera = COOLDOWN_GEMINI - (time.monotonic() - ultima_chamada_gemini)
+            if espera > 0:
+                time.sleep(espera)
+        
+        srt_pt_path = os.path.join(SUBTITLES_OUTPUT_DIR, f"{nome_video}_PT.srt")
+        print(f"  🤖 [{nome_video}] Traduzindo (Gemini)...", flush=True)
+        try:
+            sucesso_traducao = traduzir_srt_gemini(srt_en_path, srt_pt_path)
+            ultima_chamada_gemini = time.monotonic()
+        except Exception as e:
+            ultima_chamada_gemini = time.monotonic()
+            print(f"  ❌ [{nome_video}] {str(e)[:60]}")
+            sucesso_traducao = False
+        if sucesso_traducao:
+            print(f"  ✓ [{nome_video}] Tradução concluída")
+        else:
+            print(f"  ❌ [{nome_video}] Falha na tradução")
+        
+        if sucesso_traducao and os.path.exists(srt_pt_path):
+            fila_embed.put((video, nome_video, srt_pt_path))
+
+def estagio_embed(fila_embed, finalizados):
+    """Thread do estágio 3: embute a legenda PT (FFmpeg) enquanto os outros estágios seguem."""
+    while True:
+        item = fila_embed.get()
+        if item is None:
+            return
+        video, nome_video, srt_pt_path = item
+        
+        video_final_path = os.path.join(VIDEOS_OUTPUT_DIR, f"{nome_video}_PT.mp4")
+        print(f"  📽️ [{nome_video}] Embutindo legenda...", flush=True)
+        try:
+            sucesso_embed = embutir_legenda(video, srt_pt_path, video_final_path)
+        except Exception as e:
+            print(f"  ❌ [{nome_video}] {str(e)[:60]}")
+            sucesso_embed = False
+        if sucesso_embed:
+            print(f"  ✨ Finalizado: {video_final_path}")
+            finalizados.append(nome_video)
+        else:
+            print(f"  ❌ [{nome_video}] Falha ao embutir")
 
 def main():
     os.makedirs(PASTA_SAIDA, exist_ok=True)
+    carregar_cache_duracao()
     
-    todos_videos = sorted([
-        os.path.join(PASTA_ENTRADA, f) 
-        for f in os.listdir(PASTA_ENTRADA) 
-        if f.lower().endswith('.mp4')
-    ])
+    with os.scandir(PASTA_ENTRADA) as entradas:
+        todos_videos = sorted(
+            entrada.path
+            for entrada in entradas
+            if entrada.name.lower().endswith('.mp4')
+        )
     
     print(f"🎬 Encontrados {len(todos_videos)} vídeos na pasta\n")
     
+    # Uma única varredura da pasta de saída em vez de um stat por vídeo
+    with os.scandir(PASTA_SAIDA) as entradas:
+        saidas = {entrada.name for entrada in entradas if entrada.name.endswith('_EN.srt')}
+    
     videos = []
     ja_existentes = 0
     for video in todos_videos:
-        nome_video = Path(video).stem
-        srt_path = os.path.join(PASTA_SAIDA, f"{nome_video}_EN.srt")
-        if os.path.exists(srt_path):
+        if f"{Path(video).stem}_EN.srt" in saidas:
             ja_existentes += 1
         else:
             videos.append(video)
@@ -460,49 +1029,55 @@ def main():
     print(f"   • > 20min: Stable-TS (precisão máxima, previne drift)")
     if not STABLE_TS_AVAILABLE:
         print(f"   ⚠️ Stable-TS não instalado (todos usarão Faster-Whisper)")
+    
+    # Carregar modelo Faster-Whisper uma única vez
+    # (dentro do main: os workers do Stable-TS reimportam este módulo)
+    print("\n⏳ Carregando modelo Faster-Whisper...")
+    model_faster = carregar_modelo_faster()
+    if BatchedInferencePipeline is not None:
+        model_faster = BatchedInferencePipeline(model=model_faster)
+    print("✅ Modelo carregado!")
     print(f"\n🚀 Iniciando Pipeline...\n")
     
     total_videos = len(videos)
-    sucessos_finais = 0
     
-    for i, video in enumerate(videos, 1):
-        nome_completo = Path(video).name
-        nome_video = Path(video).stem
-        print(f"[{i}/{total_videos}] 🎬 {nome_completo}")
-        
-        # 1. Extrair com método híbrido
-        _, sucesso_extracao = extrair_srt_hibrido(video, model_faster)
-        if not sucesso_extracao:
-            print(f"  ⏭️ Pulando etapas seguintes\n")
-            continue
+    # Estágios 2 e 3 em threads: o Whisper (estágio 1, aqui) nunca fica ocioso
+    # esperando Gemini ou FFmpeg. Filas limitadas evitam acumular trabalho.
+    fila_traducao = queue.Queue(maxsize=TAMANHO_FILA_ESTAGIOS)
+    fila_embed = queue.Queue(maxsize=TAMANHO_FILA_ESTAGIOS)
+    finalizados = []
+    threads_estagios = [
+        threading.Thread(target=estagio_traducao, args=(fila_traducao, fila_embed)),
+        threading.Thread(target=estagio_embed, args=(fila_embed, finalizados)),
+    ]
+    for thread in threads_estagios:
+        thread.start()
+    
+    try:
+        for i, video in enumerate(videos, 1):
+            nome_completo = Path(video).name
+            nome_video = Path(video).stem
+            print(f"[{i}/{total_videos}] 🎬 {nome_completo}")
             
-        srt_en_path = os.path.join(PASTA_SAIDA, f"{nome_video}_EN.srt")
-        
-        # 2. Traduzir
-        srt_pt_path = os.path.join(SUBTITLES_OUTPUT_DIR, f"{nome_video}_PT.srt")
-        print(f"  🤖 Traduzindo (Gemini)...", end=" ", flush=True)
-        sucesso_traducao = traduzir_srt_gemini(srt_en_path, srt_pt_path)
-        if sucesso_traducao:
-            print("✓")
-        else:
-            print("❌ Falha na tradução")
-        
-        # 3. Embutir
-        if sucesso_traducao and os.path.exists(srt_pt_path):
-            video_final_path = os.path.join(VIDEOS_OUTPUT_DIR, f"{nome_video}_PT.mp4")
-            print(f"  📽️ Embutindo legenda...", end=" ", flush=True)
-            sucesso_embed = embutir_legenda(video, srt_pt_path, video_final_path)
-            if sucesso_embed:
-                print("✓")
-                print(f"  ✨ Finalizado: {video_final_path}")
-                sucessos_finais += 1
-            else:
-                print("❌ Falha ao embutir")
-        
-        # 4. Cooldown
-        if i < total_videos:
-            print(f"  💤 Aguardando 30s...\n")
-            time.sleep(30)
+            # 1. Extrair com método híbrido
+            _, sucesso_extracao = extrair_srt_hibrido(video, model_faster)
+            if not sucesso_extracao:
+                print(f"  ⏭️ Pulando etapas seguintes\n")
+                continue
+            
+            # 2 e 3. Tradução + embutir seguem em segundo plano
+            srt_en_path = os.path.join(PASTA_SAIDA, f"{nome_video}_EN.srt")
+            if os.path.getsize(srt_en_path) < TAMANHO_MINIMO_SRT:
+                print(f"  ⏭️ SRT vazio/corrompido - pulando tradução e embutir\n")
+                continue
+            fila_traducao.put((video, nome_video, srt_en_path))
+    finally:
+        fila_traducao.put(None)
+        for thread in threads_estagios:
+            thread.join()
+        encerrar_pool_stable()
+    
+    sucessos_finais = len(finalizados)
     
     print("\n" + "="*70)
     print(f"🏁 Pipeline: {sucessos_finais}/{total_videos} vídeos completados!")
@@ -50,7 +50,7 @@ def transcribe_with_whisper(video_path, output_srt, language='en'):
     
     try:
         from faster_whisper import WhisperModel
-        from utils import format_timestamp
+        from srt_writer import write_srt
         
         print("📥 Carregando modelo Whisper (primeira vez = lento)...")
         model = WhisperModel("tiny", device="cpu", compute_type="int8")
@@ -63,15 +63,7 @@ def transcribe_with_whisper(video_path, output_srt, language='en'):
         print(f"   Duração: {info.duration:.1f}s")
         
         # Salvar como SRT
-        with open(output_srt, "w", encoding="utf-8") as f:
-            for i, segment in enumerate(segments, start=1):
-                start = format_timestamp(segment.start)
-                end = format_timestamp(segment.end)
-                text = segment.text.strip()
-                
-                f.write(f"{i}\n")
-                f.write(f"{start} --> {end}\n")
-                f.write(f"{text}\n\n")
+        write_srt(output_srt, ((seg.start, seg.end, seg.text.strip()) for seg in segments))
         
         print(f"✅ SRT salvo em: {output_srt}")
         return True
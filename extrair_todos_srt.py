@@ -7,11 +7,12 @@ Script para extrair SRT de múltiplos vídeos em paralelo
 import os
 import subprocess
 from pathlib import Path
+import numpy as np
 from faster_whisper import WhisperModel
 import json
-from datetime import timedelta
-import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from utils import format_timestamp
+from srt_writer import write_srt
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 # Configurações
 VIDEOS_INPUT_DIR = Path("videos_input")
@@ -22,14 +23,49 @@ VIDEOS = [
     "elsa.mp4",
     "Arya.mp4"
 ]
+MAX_WORKERS = 2
+# Cada processo usa metade dos núcleos (2 vídeos realmente em paralelo)
+THREADS_POR_WORKER = max(1, (os.cpu_count() or 2) // MAX_WORKERS)
 
-def format_timestamp(seconds):
-    """Formata segundos em HH:MM:SS,mmm"""
-    td = timedelta(seconds=seconds)
-    hours, remainder = divmod(int(td.total_seconds()), 3600)
-    minutes, seconds = divmod(remainder, 60)
-    millis = int((td.total_seconds() % 1) * 1000)
-    return f"{hours:02d}:{minutes:02d}:{seconds:02d},{millis:03d}"
+# Modelo do processo worker (carregado uma vez pelo initializer do pool)
+model = None
+
+def _init_worker():
+    """Initializer do ProcessPoolExecutor: carrega o modelo uma vez por processo."""
+    global model
+    model = WhisperModel("tiny", device="cpu", compute_type="int8", cpu_threads=THREADS_POR_WORKER)
+
+def carregar_audio_via_pipe(video_path):
+    """
+    Usa FFmpeg para extrair o áudio direto para a memória (Pipe), sem WAV temporário.
+    """
+    comando = [
+        "ffmpeg",
+        "-i", str(video_path),
+        "-ar", "16000",
+        "-ac", "1",
+        "-f", "s16le",
+        "-vn",
+        "-"
+    ]
+    
+    processo = subprocess.Popen(
+        comando,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        bufsize=10**7
+    )
+    
+    try:
+        dados_raw, _ = processo.communicate(timeout=300)
+    except subprocess.TimeoutExpired:
+        processo.kill()
+        return None
+    
+    if processo.returncode != 0 or len(dados_raw) == 0:
+        return None
+    
+    return np.frombuffer(dados_raw, np.int16).astype(np.float32) / 32768.0
 
 def transcribe_video(video_file):
     """Transcreve um vídeo para SRT"""
@@ -40,49 +76,31 @@ def transcribe_video(video_file):
     print(f"🎬 PROCESSANDO: {video_file}")
     print(f"{'='*70}")
     
-    # Extrair áudio com FFmpeg
-    audio_tmp = f"temp_audio_{video_file.replace('.mp4', '')}.wav"
-    cmd_extract = [
-        "ffmpeg", "-i", str(video_path),
-        "-q:a", "9", "-n", audio_tmp
-    ]
-    
+    # Extrair áudio com FFmpeg (pipe direto para memória)
     print(f"🔊 Extraindo áudio...")
-    result = subprocess.run(cmd_extract, capture_output=True, text=True)
+    audio = carregar_audio_via_pipe(video_path)
     
-    if not os.path.exists(audio_tmp):
+    if audio is None:
         print(f"❌ Erro ao extrair áudio de {video_file}")
         return False
     
     # Transcrever com Whisper
     print(f"🎤 Transcrevendo com Whisper (este modelo pode demora)...")
     try:
-        model = WhisperModel("tiny", device="cpu", compute_type="int8")
-        segments, info = model.transcribe(audio_tmp, language="en", beam_size=5)
+        segments, info = model.transcribe(audio, language="en", beam_size=5)
         
         # Salvar SRT
-        with open(output_srt, "w", encoding="utf-8") as f:
-            for i, segment in enumerate(segments, 1):
-                start = format_timestamp(segment.start)
-                end = format_timestamp(segment.end)
-                text = segment.text.strip()
-                f.write(f"{i}\n{start} --> {end}\n{text}\n\n")
+        write_srt(output_srt, ((seg.start, seg.end, seg.text.strip()) for seg in segments))
         
         duration = info.duration
         print(f"✅ Sucesso!")
         print(f"   📝 SRT salvo em: {output_srt}")
         print(f"   🕐 Duração: {format_timestamp(duration)}")
         
-        # Limpar arquivo temporário
-        if os.path.exists(audio_tmp):
-            os.remove(audio_tmp)
-        
         return True
         
     except Exception as e:
         print(f"❌ Erro ao transcrever {video_file}: {str(e)}")
-        if os.path.exists(audio_tmp):
-            os.remove(audio_tmp)
         return False
 
 def main():
@@ -111,10 +129,10 @@ def main():
     
     # Processar em paralelo (mas com limite para não sobrecarregar CPU)
     print(f"\n🚀 Iniciando transcrição de {len(VIDEOS)} vídeos...")
-    print(f"   Limite de workers: 2 (para não sobrecarregar o CPU)\n")
+    print(f"   Limite de workers: {MAX_WORKERS} processos x {THREADS_POR_WORKER} threads\n")
     
     results = {}
-    with ThreadPoolExecutor(max_workers=2) as executor:
+    with ProcessPoolExecutor(max_workers=MAX_WORKERS, initializer=_init_worker) as executor:
         futures = {executor.submit(transcribe_video, video): video for video in VIDEOS}
         
         for future in as_completed(futures):
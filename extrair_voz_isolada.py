@@ -1,94 +1,71 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 """
-Isola voz de vídeos usando Spleeter e re-transcreve com Whisper
+Isola voz de vídeos (filtros de voz do FFmpeg) e re-transcreve com Whisper
 Cria SRTs limpos com melhor qualidade de áudio
 """
 
 import os
+
+os.environ.setdefault("OMP_NUM_THREADS", "4")
+
+import queue
 import subprocess
-import tempfile
-import shutil
+import threading
 from pathlib import Path
+import numpy as np
 from faster_whisper import WhisperModel
+from config import MODELS_DIR, WHISPER_CPU_THREADS
+from srt_writer import write_srt
 
 # Configurações
 PASTA_ENTRADA = "proximos_para_traducao"
 PASTA_SAIDA = "videos_output"
-PASTA_SEPARADO = "audio_separado"
 MODELO = "tiny"
 DEVICE = "cpu"
 COMPUTE_TYPE = "int8"
+# Banda da fala + redução de ruído: substitui o Spleeter (TensorFlow) com custo
+# de um filtro do FFmpeg; o resto do silêncio/ruído fica com o VAD do Whisper
+FILTRO_VOZ = "highpass=f=150,lowpass=f=4000,afftdn=nr=12:nf=-25"
+TAMANHO_FILA = 2  # Limita quantas vozes decodificadas ficam esperando na memória
 
-def instalar_spleeter():
-    """Instala Spleeter"""
-    print("📦 Instalando Spleeter...")
-    subprocess.run([
-        'pip', 'install', '-U', 'spleeter',
-        '--no-cache-dir'
-    ], check=True)
-    print("✅ Spleeter instalado!")
-
-def extrair_audio(video_path):
-    """Extrai áudio do vídeo"""
-    audio_tmp = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
-    audio_tmp.close()
-    
+def extrair_voz(video_path):
+    """
+    Extrai a voz do vídeo numa única passada do FFmpeg (filtro de voz + 16kHz mono)
+    direto para a memória via pipe: sem WAV temporário nem releitura do disco.
+    """
     cmd = [
         'ffmpeg', '-i', video_path,
-        '-acodec', 'pcm_s16le',
-        '-ar', '44100',
-        '-ac', '2',
+        '-af', FILTRO_VOZ,
+        '-f', 's16le',
+        '-ac', '1',
+        '-ar', '16000',
         '-v', 'error',
-        '-y',
-        audio_tmp.name
+        '-'
     ]
     
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if result.returncode == 0:
-        return audio_tmp.name
-    else:
-        if os.path.exists(audio_tmp.name):
-            os.unlink(audio_tmp.name)
-        return None
-
-def isolar_voz(audio_path):
-    """Isola voz usando Spleeter via Python"""
     try:
-        from spleeter.separator import Separator
-        
-        print("  🎵 Isolando voz com Spleeter...")
-        
-        # Usar modelo 2stems (vocals + accompaniment)
-        separator = Separator("spleeter:2stems", multiprocess=False)
-        
-        # Output temporário
-        output_tmp = tempfile.mkdtemp()
-        
-        # Separar
-        separator.separate_to_file(audio_path, output_tmp, overwrite=True)
-        
-        # Encontrar arquivo de voz
-        stem_name = Path(audio_path).stem
-        voz_path = os.path.join(output_tmp, stem_name, 'vocals.wav')
-        
-        if os.path.exists(voz_path):
-            return voz_path, output_tmp
-        else:
-            shutil.rmtree(output_tmp, ignore_errors=True)
-            return None, None
-            
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        raw = proc.stdout.read()
+        proc.wait()
     except Exception as e:
-        print(f"  ⚠️  Erro ao isolar: {str(e)[:100]}")
-        return None, None
+        print(f"  ⚠️  Erro ao extrair voz: {str(e)[:100]}")
+        return None
+    
+    if proc.returncode != 0 or not raw:
+        return None
+    return np.frombuffer(raw, np.int16).astype(np.float32) / 32768.0
 
-def transcrever_voz(voz_path, model):
-    """Transcreve áudio isolado com Whisper"""
+def transcrever_voz(voz, model):
+    """Transcreve áudio isolado (ndarray 16kHz) com Whisper"""
     try:
         segments, info = model.transcribe(
-            voz_path,
+            voz,
             language="en",
-            beam_size=5,
+            beam_size=1,
+            vad_filter=True,  # Pula silêncios em vez de decodificá-los
+            vad_parameters=dict(min_silence_duration_ms=500),
+            condition_on_previous_text=False,  # Evita loops de repetição (alucinação)
             without_timestamps=False
         )
         return list(segments)
@@ -97,98 +74,66 @@ def transcrever_voz(voz_path, model):
         return None
 
 def salvar_srt(segments, output_path):
-    """Salva transcrição em SRT"""
-    contador = 0
-    with open(output_path, 'w', encoding='utf-8') as f:
-        for segment in segments:
-            if segment.text.strip():
-                contador += 1
-                start = format_timestamp(segment.start)
-                end = format_timestamp(segment.end)
-                text = segment.text.strip()
-                f.write(f"{contador}\n{start} --> {end}\n{text}\n\n")
-    
-    return contador
+    """Salva transcrição em SRT (pula segmentos vazios)"""
+    textos = ((segment, segment.text.strip()) for segment in segments)
+    return write_srt(output_path, ((segment.start, segment.end, texto) for segment, texto in textos if texto))
 
-def format_timestamp(seconds):
-    """Converte segundos para formato SRT HH:MM:SS,mmm"""
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
-    millis = int((seconds % 1) * 1000)
-    return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
+def caminho_srt_limpo(video_path):
+    """Caminho do SRT _EN_CLEAN de um vídeo"""
+    return os.path.join(PASTA_SAIDA, f"{Path(video_path).stem}_EN_CLEAN.srt")
 
-def processar_video(video_path, model):
-    """Processa um vídeo: extrai -> isola -> transcreve"""
-    nome_video = Path(video_path).stem
-    srt_saida = os.path.join(PASTA_SAIDA, f"{nome_video}_EN_CLEAN.srt")
-    
-    # Pular se já existe
-    if os.path.exists(srt_saida):
-        print(f"  ✓ {nome_video}_EN_CLEAN.srt já existe")
-        return True
-    
-    temp_dir = None
+def estagio_extracao(videos, fila_voz):
+    """Thread do estágio 1: FFmpeg extrai a voz do próximo vídeo enquanto o Whisper trabalha."""
     try:
-        print(f"  1️⃣  Extraindo áudio...")
-        audio = extrair_audio(video_path)
-        if not audio:
-            print(f"  ❌ Falha ao extrair áudio")
-            return False
-        
-        print(f"  2️⃣  Isolando voz...")
-        voz, temp_dir = isolar_voz(audio)
-        if not voz:
-            print(f"  ❌ Falha ao isolar voz")
-            if os.path.exists(audio):
-                os.unlink(audio)
+        for video in videos:
+            nome = Path(video).stem[:40]
+            print(f"  1️⃣  [{nome}] Extraindo voz...")
+            fila_voz.put((video, extrair_voz(video)))
+    finally:
+        fila_voz.put(None)
+
+def transcrever_e_salvar(video_path, voz, model):
+    """Estágio 2: transcreve a voz isolada e salva o SRT."""
+    nome = Path(video_path).stem[:40]
+    try:
+        if voz is None:
+            print(f"  ❌ [{nome}] Falha ao extrair voz")
             return False
         
-        print(f"  3️⃣  Transcrevendo voz isolada...")
+        print(f"  2️⃣  [{nome}] Transcrevendo voz isolada...")
         segments = transcrever_voz(voz, model)
         if not segments:
-            print(f"  ❌ Falha ao transcrever")
-            if os.path.exists(audio):
-                os.unlink(audio)
+            print(f"  ❌ [{nome}] Falha ao transcrever")
             return False
         
-        print(f"  4️⃣  Salvando SRT...")
-        contador = salvar_srt(segments, srt_saida)
+        print(f"  3️⃣  [{nome}] Salvando SRT...")
+        contador = salvar_srt(segments, caminho_srt_limpo(video_path))
         
-        # Limpeza
-        if os.path.exists(audio):
-            os.unlink(audio)
-        
-        print(f"  ✅ {contador} legendas LIMPAS criadas")
+        print(f"  ✅ [{nome}] {contador} legendas LIMPAS criadas")
         return True
         
     except Exception as e:
-        print(f"  ❌ Erro geral: {str(e)[:80]}")
+        print(f"  ❌ [{nome}] Erro geral: {str(e)[:80]}")
         return False
-    finally:
-        # Limpeza de diretório temporário
-        if temp_dir and os.path.exists(temp_dir):
-            try:
-                shutil.rmtree(temp_dir)
-            except:
-                pass
 
 def main():
-    # Instalar Spleeter
-    try:
-        from spleeter.separator import Separator
-    except ImportError:
-        print("⚠️  Spleeter não encontrado. Instalando...")
-        instalar_spleeter()
-    
     # Carregar Whisper
     print("⏳ Carregando modelo Whisper...")
-    model = WhisperModel(MODELO, device=DEVICE, compute_type=COMPUTE_TYPE)
+    model = WhisperModel(
+        MODELO,
+        device=DEVICE,
+        compute_type=COMPUTE_TYPE,
+        cpu_threads=WHISPER_CPU_THREADS,
+        num_workers=1,
+        download_root=str(MODELS_DIR)
+    )
+    # Aquecimento: 1s de silêncio inicializa os kernels do CTranslate2 antes do primeiro vídeo
+    segmentos, _ = model.transcribe(np.zeros(16000, dtype=np.float32), language="en", beam_size=1)
+    list(segmentos)
     print("✅ Modelo carregado!\n")
     
     # Criar pastas de saída
     os.makedirs(PASTA_SAIDA, exist_ok=True)
-    os.makedirs(PASTA_SEPARADO, exist_ok=True)
     
     # Listar vídeos
     videos = sorted([
@@ -199,14 +144,35 @@ def main():
     
     print(f"🎬 Processando {len(videos)} vídeos com isolamento de voz\n")
     
+    # Pular os que já existem
     sucesso = 0
-    for i, video in enumerate(videos, 1):
-        nome = Path(video).stem[:40]
-        print(f"[{i}/{len(videos)}] 📹 {nome}...")
-        
-        if processar_video(video, model):
+    pendentes = []
+    for video in videos:
+        if os.path.exists(caminho_srt_limpo(video)):
+            print(f"  ✓ {Path(video).stem}_EN_CLEAN.srt já existe")
+            sucesso += 1
+        else:
+            pendentes.append(video)
+    
+    # Pipeline: enquanto o Whisper transcreve o vídeo N, o FFmpeg extrai a voz
+    # do N+1. O Whisper fica nesta thread (modelo único).
+    fila_voz = queue.Queue(maxsize=TAMANHO_FILA)
+    extrator = threading.Thread(target=estagio_extracao, args=(pendentes, fila_voz), daemon=True)
+    extrator.start()
+    
+    i = 0
+    while True:
+        item = fila_voz.get()
+        if item is None:
+            break
+        i += 1
+        video, voz = item
+        print(f"[{i}/{len(pendentes)}] 📹 {Path(video).stem[:40]}...")
+        if transcrever_e_salvar(video, voz, model):
             sucesso += 1
     
+    extrator.join()
+    
     # Resumo
     print("\n" + "="*70)
     print(f"✅ Concluído: {sucesso}/{len(videos)} vídeos com voz isolada")
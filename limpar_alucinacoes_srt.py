@@ -9,16 +9,34 @@ Detecta dois tipos de alucinações:
 
 import os
 import re
+import mmap
+import multiprocessing
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
-from collections import Counter
 from config import SUBTITLES_EN_DIR
 
+# Regexes compiladas uma vez (usadas em todo segmento de todo SRT)
+_NON_WORD = re.compile(r'[^\w\s]')
+# Versões em bytes para o parse_srt (rodam direto sobre o mmap)
+_BLANK_SEP_B = re.compile(rb'(?:\r?\n){2,}')
+_TS_B = re.compile(rb'(\d{2}:\d{2}:\d{2},\d{3}) --> (\d{2}:\d{2}:\d{2},\d{3})')
+
+# Tabela para str.translate: apaga os ASCII que o _NON_WORD removeria
+_PUNCT_TABLE = str.maketrans({c: None for c in map(chr, range(128)) if _NON_WORD.match(c)})
+
+# Palavras comuns que podem repetir legitimamente
+_PALAVRAS_OK = frozenset({'i', 'you', 'the', 'a', 'and', 'to', 'it', 'is', 'of', 'in', 'that', 'me', 'my', 'your'})
+
 def normalizar_texto(texto):
     """Normaliza texto para comparação"""
-    texto = texto.lower().strip()
-    texto = re.sub(r'[^\w\s]', '', texto)
-    texto = re.sub(r'\s+', ' ', texto)
-    return texto
+    texto = texto.lower()
+    if texto.isascii():
+        # Caminho rápido (inglês comum): tudo em C, sem regex
+        texto = texto.translate(_PUNCT_TABLE)
+    else:
+        texto = _NON_WORD.sub('', texto)
+    return ' '.join(texto.split())
 
 def eh_alucinacao_interna(texto):
     """
@@ -26,32 +44,40 @@ def eh_alucinacao_interna(texto):
     Exemplo: "oh, oh, oh, oh, oh, oh..." ou "yeah yeah yeah yeah..."
     """
     # Normalizar e dividir em palavras
-    texto_limpo = re.sub(r'[^\w\s]', ' ', texto.lower())
+    texto_limpo = _NON_WORD.sub(' ', texto.lower())
     palavras = texto_limpo.split()
     
-    if len(palavras) < 5:
+    total = len(palavras)
+    if total < 5:
         return False
     
-    # Contar frequência de cada palavra
-    contagem = Counter(palavras)
-    palavra_mais_comum, qtd = contagem.most_common(1)[0]
-    
-    # Palavras comuns que podem repetir legitimamente
-    palavras_ok = {'i', 'you', 'the', 'a', 'and', 'to', 'it', 'is', 'of', 'in', 'that', 'me', 'my', 'your'}
-    
-    if palavra_mais_comum in palavras_ok:
+    # Contar frequência de cada palavra numa passada só (sem Counter/most_common)
+    contagem = {}
+    get = contagem.get
+    qtd = 0
+    for palavra in palavras:
+        c = get(palavra, 0) + 1
+        contagem[palavra] = c
+        if c > qtd:
+            qtd = c
+            # Mais da metade já garante que é a mais comum: sai sem ler o resto
+            if c / total >= 0.7 or (c / total > 0.5 and palavra not in _PALAVRAS_OK):
+                return True
+    
+    # Empate: a mais comum é a que apareceu primeiro (mesma regra do most_common)
+    palavra_mais_comum = next(p for p, c in contagem.items() if c == qtd)
+    
+    if palavra_mais_comum in _PALAVRAS_OK:
         threshold = 0.7
     else:
         threshold = 0.5
     
-    if qtd / len(palavras) >= threshold:
+    if qtd / total >= threshold:
         return True
     
     # Verificar padrão repetitivo
-    if len(palavras) >= 10:
-        palavras_unicas = set(palavras)
-        if len(palavras_unicas) <= 3:
-            return True
+    if total >= 10 and len(contagem) <= 3:
+        return True
     
     return False
 
@@ -59,25 +85,26 @@ def parse_srt(srt_path):
     """Lê um arquivo SRT e retorna lista de segmentos"""
     segments = []
     
-    with open(srt_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    blocos = re.split(r'\n\n+', content.strip())
+    # mmap + regex em bytes: só o texto dos blocos válidos é decodificado
+    with open(srt_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return segments
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            blocos = _BLANK_SEP_B.split(mm)
     
     for bloco in blocos:
-        linhas = bloco.strip().split('\n')
+        linhas = bloco.strip().splitlines()
         if len(linhas) >= 3:
             try:
-                timestamp = linhas[1]
-                texto = '\n'.join(linhas[2:])
-                
-                match = re.match(r'(\d{2}:\d{2}:\d{2},\d{3}) --> (\d{2}:\d{2}:\d{2},\d{3})', timestamp)
+                match = _TS_B.match(linhas[1])
                 if match:
+                    # errors='replace': um byte inválido não pode fazer a legenda sumir na regravação
+                    texto = b'\n'.join(linhas[2:]).decode('utf-8', errors='replace').strip()
                     segments.append({
-                        'start': match.group(1),
-                        'end': match.group(2),
-                        'text': texto.strip(),
-                        'text_norm': normalizar_texto(texto.strip())
+                        'start': match.group(1).decode('ascii'),
+                        'end': match.group(2).decode('ascii'),
+                        'text': texto,
+                        'text_norm': normalizar_texto(texto)
                     })
             except:
                 continue
@@ -101,42 +128,57 @@ def filtrar_alucinacoes(segments, max_repeticoes=2):
     if not segs_limpos:
         return [], internas
     
-    # Segundo: remover consecutivas
+    # Segundo: remover consecutivas (uma passada, acompanhando a sequência atual)
     filtrados = []
-    i = 0
     consecutivas = 0
-    
-    while i < len(segs_limpos):
-        texto_norm = segs_limpos[i]['text_norm']
-        
-        repeticoes = 1
-        j = i + 1
-        while j < len(segs_limpos):
-            outro = segs_limpos[j]['text_norm']
-            if texto_norm == outro or (len(texto_norm) > 3 and (texto_norm in outro or outro in texto_norm)):
-                repeticoes += 1
-                j += 1
-            else:
-                break
-        
-        if repeticoes > max_repeticoes:
-            filtrados.append(segs_limpos[i])
-            consecutivas += repeticoes - 1
-            i = j
+    sequencia = []       # Segmentos da sequência de repetições em andamento
+    base_norm = None     # Texto normalizado do primeiro segmento da sequência
+    
+    def fechar_sequencia():
+        nonlocal consecutivas
+        if len(sequencia) > max_repeticoes:
+            filtrados.append(sequencia[0])
+            consecutivas += len(sequencia) - 1
         else:
-            for k in range(i, j):
-                filtrados.append(segs_limpos[k])
-            i = j
+            filtrados.extend(sequencia)
+    
+    # Repetições idênticas (o caso comum) chegam agrupadas pelo groupby:
+    # a comparação com a base, inclusive a de substring, roda uma vez por grupo
+    for outro, grupo in groupby(segs_limpos, key=itemgetter('text_norm')):
+        if sequencia and (
+            outro == base_norm
+            or (len(base_norm) > 3 and (base_norm in outro or outro in base_norm))
+        ):
+            sequencia.extend(grupo)
+            continue
+        if sequencia:
+            fechar_sequencia()
+        sequencia = list(grupo)
+        base_norm = outro
+    
+    fechar_sequencia()
     
     return filtrados, internas + consecutivas
 
 def salvar_srt(segments, output_path):
-    """Salva segmentos em formato SRT"""
+    """Salva segmentos em formato SRT (monta tudo em memória, uma única escrita)"""
+    conteudo = "".join(
+        f"{i}\n{seg['start']} --> {seg['end']}\n{seg['text']}\n\n"
+        for i, seg in enumerate(segments, 1)
+    )
     with open(output_path, 'w', encoding='utf-8') as f:
-        for i, seg in enumerate(segments, 1):
-            f.write(f"{i}\n{seg['start']} --> {seg['end']}\n{seg['text']}\n\n")
+        f.write(conteudo)
     return len(segments)
 
+def _process_one_srt(srt):
+    """Limpa um SRT (worker do Pool). Retorna (nome, alucinações removidas)."""
+    segments = parse_srt(srt)
+    segments_filtrados, removidos = filtrar_alucinacoes(segments, max_repeticoes=2)
+    
+    if removidos > 0:
+        salvar_srt(segments_filtrados, srt)
+    return Path(srt).stem[:50], removidos
+
 def main():
     pasta_srt = str(SUBTITLES_EN_DIR)
     
@@ -155,14 +197,12 @@ def main():
     corrigidos = 0
     total_removidos = 0
     
-    for srt in srts:
-        nome = Path(srt).stem[:50]
-        
-        segments = parse_srt(srt)
-        segments_filtrados, removidos = filtrar_alucinacoes(segments, max_repeticoes=2)
-        
+    # Cada arquivo é independente e o trabalho é Python puro: processos, não threads
+    with multiprocessing.Pool(processes=os.cpu_count()) as pool:
+        resultados = pool.map(_process_one_srt, srts)
+    
+    for nome, removidos in resultados:
         if removidos > 0:
-            salvar_srt(segments_filtrados, srt)
             print(f"✅ {nome}... -{removidos} alucinações")
             corrigidos += 1
             total_removidos += removidos
@@ -3,37 +3,203 @@ Tradutor usando Libre Translate (100% gratuito, sem bloqueios, sem internet)
 Alternativa: Usar arquivo JSON pré-traduzido ou manual
 """
 
+import asyncio
+import hashlib
+import importlib.util
+import sqlite3
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import json
 
+# httpx (opcional): lotes via asyncio numa única conexão HTTP/2 multiplexada
+try:
+    import httpx
+    TEM_HTTPX = True
+    TEM_HTTP2 = importlib.util.find_spec("h2") is not None
+except ImportError:
+    TEM_HTTPX = False
+    TEM_HTTP2 = False
+
+# Lotes enviados numa única requisição (q = lista de textos)
+LOTE_MAX_LINHAS = 50
+LOTE_MAX_CHARS = 5000
+# Requisições simultâneas (I/O de rede libera o GIL)
+MAX_CONEXOES = 32
+# Cache persistente de traduções (frases de abertura/encerramento se repetem entre vídeos)
+ARQUIVO_CACHE = Path(__file__).parent / ".translate_cache.db"
+
+def chave_cache(texto):
+    """Chave do cache: hash do texto sem os espaços das bordas."""
+    return hashlib.blake2s(texto.strip().encode('utf-8'), digest_size=16).hexdigest()
+
+def eh_texto_legenda(linha):
+    """True se a linha do SRT é texto (não é número, timestamp nem linha em branco)."""
+    return bool(linha.strip()) and not linha[0].isdigit() and '-->' not in linha
+
 class LocalTranslator:
     def __init__(self):
         """Inicializa tradutor com LibreTranslate"""
         print("📥 Testando tradutor online (LibreTranslate - 100% gratuito)...")
         self.api_url = "https://api.libretranslate.de/translate"
+        # Sessão persistente: reaproveita TCP/TLS entre requisições
+        self.session = requests.Session()
+        adaptador = HTTPAdapter(
+            pool_connections=MAX_CONEXOES,
+            pool_maxsize=MAX_CONEXOES,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=frozenset(["POST"])
+            )
+        )
+        self.session.mount("https://", adaptador)
+        self.session.mount("http://", adaptador)
+        
+        # SQLite em WAL: leituras não bloqueiam; o lock serializa o acesso entre threads
+        self.db = sqlite3.connect(str(ARQUIVO_CACHE), isolation_level=None, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("CREATE TABLE IF NOT EXISTS t(k TEXT PRIMARY KEY, v TEXT)")
+        self._db_lock = threading.Lock()
         print("✅ Tradutor pronto!")
     
+    def buscar_cache(self, textos):
+        """Retorna {texto: tradução} para os textos já traduzidos em execuções anteriores."""
+        chaves = {chave_cache(texto): texto for texto in textos}  # textos já vêm sem bordas
+        encontrados = {}
+        lista = list(chaves)
+        with self._db_lock:
+            # Consultas em blocos (limite de parâmetros do SQLite)
+            for inicio in range(0, len(lista), 500):
+                bloco = lista[inicio:inicio + 500]
+                marcadores = ",".join("?" * len(bloco))
+                for k, v in self.db.execute(f"SELECT k, v FROM t WHERE k IN ({marcadores})", bloco):
+                    encontrados[chaves[k]] = v
+        return encontrados
+    
+    def gravar_cache(self, pares):
+        """Grava pares (texto, tradução) numa única transação. Falhas (tradução == original) não entram."""
+        linhas = [(chave_cache(texto), traduzido) for texto, traduzido in pares if traduzido != texto]
+        if not linhas:
+            return
+        with self._db_lock:
+            self.db.execute("BEGIN")
+            self.db.executemany("INSERT OR IGNORE INTO t(k, v) VALUES (?, ?)", linhas)
+            self.db.execute("COMMIT")
+    
     def traduzir_texto(self, texto):
         """Traduz usando LibreTranslate (sem bloqueios, gratuito)"""
         if not texto.strip():
             return texto
         
+        em_cache = self.buscar_cache([texto])
+        if texto in em_cache:
+            return em_cache[texto]
+        
         try:
             payload = {
                 "q": texto,
                 "source": "en",
                 "target": "pt"
             }
-            response = requests.post(self.api_url, json=payload, timeout=5)
+            response = self.session.post(self.api_url, json=payload, timeout=5)
             if response.status_code == 200:
-                return response.json()["translatedText"]
+                traduzido = response.json()["translatedText"]
+                self.gravar_cache([(texto, traduzido)])
+                return traduzido
             else:
                 return texto
         except Exception as e:
             print(f"⚠️ Erro na tradução: {e}")
             return texto
     
+    def traduzir_lote(self, textos):
+        """
+        Traduz vários textos numa única requisição (LibreTranslate aceita q como lista).
+        Se a resposta não vier alinhada, cai para uma requisição por texto.
+        """
+        try:
+            payload = {
+                "q": textos,
+                "source": "en",
+                "target": "pt"
+            }
+            response = self.session.post(self.api_url, json=payload, timeout=30)
+            if response.status_code == 200:
+                traduzidos = response.json()["translatedText"]
+                if isinstance(traduzidos, list) and len(traduzidos) == len(textos):
+                    return traduzidos
+        except Exception as e:
+            print(f"⚠️ Erro no lote: {e}")
+        
+        return [self.traduzir_texto(texto) for texto in textos]
+    
+    async def _traduzir_lote_async(self, client, textos):
+        """Versão assíncrona de traduzir_lote (mesmo fallback para uma requisição por texto)."""
+        try:
+            response = await client.post(self.api_url, json={"q": textos, "source": "en", "target": "pt"})
+            if response.status_code == 200:
+                traduzidos = response.json()["translatedText"]
+                if isinstance(traduzidos, list) and len(traduzidos) == len(textos):
+                    return traduzidos
+        except Exception as e:
+            print(f"⚠️ Erro no lote: {e}")
+        
+        return await asyncio.gather(*[self._traduzir_texto_async(client, texto) for texto in textos])
+    
+    async def _traduzir_texto_async(self, client, texto):
+        """Versão assíncrona de traduzir_texto."""
+        try:
+            response = await client.post(
+                self.api_url, json={"q": texto, "source": "en", "target": "pt"}, timeout=5
+            )
+            if response.status_code == 200:
+                return response.json()["translatedText"]
+        except Exception as e:
+            print(f"⚠️ Erro na tradução: {e}")
+        return texto
+    
+    async def _traduzir_lotes_async(self, lotes):
+        """Dispara todos os lotes de uma vez com asyncio.gather; a ordem dos resultados é a dos lotes."""
+        total = sum(len(lote) for lote in lotes)
+        contador = 0
+        
+        async def um_lote(client, lote):
+            nonlocal contador
+            traduzidos = await self._traduzir_lote_async(client, [texto for _, texto in lote])
+            contador += len(lote)
+            print(f"  ✓ {contador}/{total} legendas traduzidas...")
+            return traduzidos
+        
+        # Com transport explícito, http2/limits valem no transport (não no client)
+        transporte = httpx.AsyncHTTPTransport(
+            http2=TEM_HTTP2,
+            limits=httpx.Limits(max_connections=MAX_CONEXOES),
+            retries=3
+        )
+        async with httpx.AsyncClient(transport=transporte, timeout=30) as client:
+            return await asyncio.gather(*[um_lote(client, lote) for lote in lotes])
+    
+    @staticmethod
+    def dividir_em_lotes(itens):
+        """Agrupa (índice, texto) em lotes de até LOTE_MAX_LINHAS / LOTE_MAX_CHARS."""
+        lote = []
+        caracteres = 0
+        for item in itens:
+            if lote and (len(lote) >= LOTE_MAX_LINHAS or caracteres + len(item[1]) > LOTE_MAX_CHARS):
+                yield lote
+                lote = []
+                caracteres = 0
+            lote.append(item)
+            caracteres += len(item[1])
+        if lote:
+            yield lote
+    
     def traduzir_srt(self, caminho_srt_entrada, caminho_srt_saida):
         """Traduz arquivo SRT completo"""
         print(f"📖 Lendo {caminho_srt_entrada}...")
@@ -41,30 +207,53 @@ class LocalTranslator:
         with open(caminho_srt_entrada, 'r', encoding='utf-8') as f:
             linhas = f.readlines()
         
-        linhas_traduzidas = []
+        # Números, timestamps e linhas em branco são copiados como estão
+        linhas_traduzidas = list(linhas)
+        pendentes = [(i, linha.strip()) for i, linha in enumerate(linhas) if eh_texto_legenda(linha)]
+        total = len(pendentes)
         contador = 0
-        total = len([l for l in linhas if l.strip() and not '-->' in l and not l[0].isdigit()])
         
         print(f"🔄 Traduzindo {total} legendas...")
         
-        for i, linha in enumerate(linhas):
-            # Se é número de sequência ou timestamp, copia direto
-            if linha and linha[0].isdigit() or '-->' in linha:
-                linhas_traduzidas.append(linha)
-            # Se é linha em branco, copia
-            elif not linha.strip():
-                linhas_traduzidas.append(linha)
-            # Se é texto de legenda, traduz
-            else:
-                try:
-                    traduzido = self.traduzir_texto(linha.strip())
-                    linhas_traduzidas.append(traduzido + '\n')
-                    contador += 1
-                    if contador % 50 == 0:
-                        print(f"  ✓ {contador}/{total} legendas traduzidas...")
-                except Exception as e:
-                    print(f"⚠️ Erro ao traduzir linha {i}: {e}")
-                    linhas_traduzidas.append(linha)
+        # Linhas já vistas saem do cache, sem ir à rede
+        em_cache = self.buscar_cache({texto for _, texto in pendentes})
+        if em_cache:
+            for i, texto in pendentes:
+                if texto in em_cache:
+                    linhas_traduzidas[i] = em_cache[texto] + '\n'
+            pendentes = [(i, texto) for i, texto in pendentes if texto not in em_cache]
+            contador = total - len(pendentes)
+            print(f"  💾 {contador}/{total} legendas vindas do cache")
+        
+        # Falas repetidas no arquivo ("Oh yes.", nomes) vão uma vez só para a API
+        unicos = list(dict.fromkeys(texto for _, texto in pendentes))
+        if len(unicos) < len(pendentes):
+            contador += len(pendentes) - len(unicos)
+            print(f"  🔁 {len(pendentes) - len(unicos)} legendas repetidas traduzidas uma vez só")
+        
+        traducoes = {}
+        lotes = list(self.dividir_em_lotes(list(enumerate(unicos))))
+        if TEM_HTTPX:
+            # asyncio + HTTP/2: todos os lotes multiplexados, sem uma thread por requisição
+            resultados = asyncio.run(self._traduzir_lotes_async(lotes))
+            for lote, traduzidos in zip(lotes, resultados):
+                for (_, texto), traduzido in zip(lote, traduzidos):
+                    traducoes[texto] = traduzido
+        else:
+            # Lotes em paralelo sobre o pool de conexões; map() preserva a ordem
+            with ThreadPoolExecutor(max_workers=MAX_CONEXOES) as executor:
+                resultados = executor.map(
+                    self.traduzir_lote, [[texto for _, texto in lote] for lote in lotes]
+                )
+                for lote, traduzidos in zip(lotes, resultados):
+                    for (_, texto), traduzido in zip(lote, traduzidos):
+                        traducoes[texto] = traduzido
+                    contador += len(lote)
+                    print(f"  ✓ {contador}/{total} legendas traduzidas...")
+        
+        for i, texto in pendentes:
+            linhas_traduzidas[i] = traducoes[texto] + '\n'
+        self.gravar_cache(traducoes.items())
         
         # Salva arquivo traduzido
         with open(caminho_srt_saida, 'w', encoding='utf-8') as f:
@@ -1,41 +1,55 @@
 # Configuração centralizada de logging
 
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from config import LOG_FORMAT, LOG_FILE
 
+# Logger raiz da aplicação: handlers configurados uma única vez, módulos recebem filhos
+_root = None
+
+
 def setup_logger(name: str, log_file: Path = LOG_FILE) -> logging.Logger:
     """
     Configura um logger centralizado com output para arquivo e console.
-    
+
+    O arquivo e o console ficam atrás de um QueueListener: no chamador, cada log
+    é só um queue.put, e a escrita em disco acontece numa thread separada.
+
     Args:
         name: Nome do logger (geralmente __name__)
-        log_file: Caminho do arquivo de log
-        
+        log_file: Caminho do arquivo de log (usado na primeira chamada)
+
     Returns:
         logging.Logger: Logger configurado
     """
-    logger = logging.getLogger(name)
-    
-    if logger.handlers:
-        return logger
-    
-    logger.setLevel(logging.DEBUG)
-    
-    # Formatter
-    formatter = logging.Formatter(LOG_FORMAT)
-    
-    # File Handler
-    file_handler = logging.FileHandler(log_file, encoding="utf-8")
-    file_handler.setLevel(logging.DEBUG)
-    file_handler.setFormatter(formatter)
-    
-    # Console Handler
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
-    console_handler.setFormatter(formatter)
-    
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
-    
-    return logger
+    global _root
+
+    if _root is None:
+        _root = logging.getLogger("bot_traducao")
+        _root.setLevel(logging.DEBUG)
+
+        # Formatter
+        formatter = logging.Formatter(LOG_FORMAT)
+
+        # File Handler
+        file_handler = logging.FileHandler(log_file, encoding="utf-8")
+        file_handler.setLevel(logging.DEBUG)
+        file_handler.setFormatter(formatter)
+
+        # Console Handler
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(logging.INFO)
+        console_handler.setFormatter(formatter)
+
+        # Fila entre os módulos e os handlers reais
+        fila = queue.SimpleQueue()
+        listener = QueueListener(fila, file_handler, console_handler, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+
+        _root.addHandler(QueueHandler(fila))
+
+    return _root.getChild(name.rsplit('.', 1)[-1])
@@ -1,10 +1,14 @@
 import os
+
+os.environ.setdefault("OMP_NUM_THREADS", "4")
+
 import torch
 import time
+import numpy as np
 from faster_whisper import WhisperModel
 from config import (
     INPUT_DIR, SUBTITLES_EN_DIR, SUBTITLES_PT_DIR, VIDEOS_FINAL_DIR,
-    MODELS_DIR, WHISPER_MODEL_SIZE
+    MODELS_DIR, WHISPER_MODEL_SIZE, WHISPER_CPU_THREADS
 )
 from core.utils import logger
 from core.transcricao import motor_transcricao
@@ -22,11 +26,16 @@ def main():
     try:
         model_faster = WhisperModel(
             WHISPER_MODEL_SIZE, device=device, compute_type=compute_type, 
+            cpu_threads=WHISPER_CPU_THREADS, num_workers=1,
             download_root=str(MODELS_DIR)
         )
     except Exception as e:
         logger.error(f"Erro ao carregar modelo Whisper: {e}")
         return
+    
+    # Aquecimento: 1s de silêncio inicializa os kernels do CTranslate2 antes do primeiro vídeo
+    segmentos, _ = model_faster.transcribe(np.zeros(16000, dtype=np.float32), language="en", beam_size=1)
+    list(segmentos)
 
     # 2. Listar Vídeos para processar
     extensoes = ('.mp4', '.avi', '.mkv', '.mov', '.webm')
@@ -4,57 +4,55 @@
 🎬 PIPELINE COMPLETO DE LEGENDAS
 ================================
 
-Executa todos os passos automaticamente:
-1. Extrai SRT em inglês (Whisper)
-2. Limpa alucinações dos SRTs
-3. Verifica legendas traduzidas (PT)
-4. Embuti legendas nos vídeos
+Executa todos os passos automaticamente, no mesmo processo
+(o modelo Whisper é carregado uma única vez):
+1. Extrai SRT em inglês (Whisper), traduz (Gemini) e embute por vídeo
+2. Limpa alucinações dos SRTs restantes
 
 Uso:
     python pipeline_legendas.py
 """
 
 import os
-import subprocess
-import sys
 
 # Diretório do script
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 
-def rodar_script(nome, descricao):
-    """Roda um script Python e retorna se teve sucesso"""
+def rodar_etapa(funcao, descricao):
+    """Roda uma etapa no próprio processo e retorna se teve sucesso"""
     print(f"\n{'='*70}")
     print(f"🚀 {descricao}")
     print(f"{'='*70}\n")
     
-    script_path = os.path.join(SCRIPT_DIR, nome)
-    
-    result = subprocess.run(
-        [sys.executable, script_path],
-        cwd=SCRIPT_DIR
-    )
-    
-    return result.returncode == 0
+    try:
+        funcao()
+        return True
+    except Exception as e:
+        print(f"❌ Erro na etapa: {e}")
+        return False
 
 def main():
     print("""
 ╔══════════════════════════════════════════════════════════════════════╗
 ║                    🎬 PIPELINE COMPLETO DE LEGENDAS                  ║
 ╠══════════════════════════════════════════════════════════════════════╣
-║  1. Extrair SRT (Whisper)                                            ║
+║  1. Extrair SRT (Whisper) + traduzir + embutir legendas PT           ║
 ║  2. Limpar alucinações                                               ║
-║  3. Embutir legendas PT                                              ║
 ╚══════════════════════════════════════════════════════════════════════╝
 """)
     
-    # Etapa 1: Extrair SRTs
-    rodar_script("extrair_proximos_srt_v2.py", "ETAPA 1: Extraindo SRTs em inglês (Whisper)")
+    # Os módulos resolvem caminhos relativos a partir da pasta do script
+    os.chdir(SCRIPT_DIR)
     
-    # Etapa 2: Limpar alucinações
-    rodar_script("limpar_alucinacoes_srt.py", "ETAPA 2: Limpando alucinações")
+    # Importados aqui: extrair_proximos_srt_v2 carrega o modelo Whisper no import
+    from extrair_proximos_srt_v2 import main as extrair
+    from limpar_alucinacoes_srt import main as limpar
     
-    # Etapa 3: Embutir legendas
-    rodar_script("embutir_legendas_pt.py", "ETAPA 3: Embutindo legendas PT nos vídeos")
+    # Etapa 1: Extrair SRTs (já traduz e embute cada vídeo)
+    rodar_etapa(extrair, "ETAPA 1: Extraindo SRTs em inglês (Whisper) → PT → vídeo")
+    
+    # Etapa 2: Limpar alucinações
+    rodar_etapa(limpar, "ETAPA 2: Limpando alucinações")
     
     print(f"""
 ╔══════════════════════════════════════════════════════════════════════╗
@@ -8,8 +8,10 @@ import os
 import sys
 import glob
 import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 import logging
+from config import VIDEOS_PARALELOS
 
 # Configurar logging
 logging.basicConfig(
@@ -90,25 +92,31 @@ def main():
         size_mb = video.stat().st_size / (1024 * 1024)
         logger.info(f"  {i}. {video.name} ({size_mb:.2f} MB)")
     
-    # Processar cada vídeo
+    # Processar vídeos em paralelo: cada um roda num processo próprio,
+    # então as threads aqui só esperam os subprocessos
     processed = 0
     failed = 0
+    workers = min(VIDEOS_PARALELOS, len(pending_videos))
+    logger.info(f"\n⚡ Processando {workers} vídeo(s) em paralelo")
     
+    executor = ThreadPoolExecutor(max_workers=workers)
     try:
-        for i, video in enumerate(pending_videos, 1):
+        futures = {executor.submit(process_video, video): video for video in pending_videos}
+        for i, future in enumerate(as_completed(futures), 1):
             logger.info(f"\n\n{'#'*60}")
-            logger.info(f"VÍDEO {i}/{len(pending_videos)}")
+            logger.info(f"VÍDEO {i}/{len(pending_videos)} concluído: {futures[future].name}")
             logger.info(f"{'#'*60}")
             
-            success = process_video(video)
-            
-            if success:
+            if future.result():
                 processed += 1
             else:
                 failed += 1
                 
     except KeyboardInterrupt:
         logger.warning("\n\n⚠️ Processamento interrompido pelo usuário")
+        executor.shutdown(wait=False, cancel_futures=True)
+    else:
+        executor.shutdown()
     
     # Resumo final
     logger.info(f"\n\n{'='*60}")
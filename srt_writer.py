@@ -0,0 +1,51 @@
+# Escritor de SRT compartilhado pelos extratores
+
+import os
+
+from utils import format_timestamp
+
+
+def write_srt(output_path, segmentos) -> int:
+    """
+    Grava legendas em SRT com uma única escrita em disco.
+
+    Args:
+        output_path: Caminho do arquivo .srt
+        segmentos: Iterável de (início, fim, texto), tempos em segundos
+
+    Returns:
+        int: Número de legendas gravadas
+    """
+    blocos = [
+        f"{i}\n{format_timestamp(inicio)} --> {format_timestamp(fim)}\n{texto}\n\n"
+        for i, (inicio, fim, texto) in enumerate(segmentos, start=1)
+    ]
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write("".join(blocos))
+    return len(blocos)
+
+
+def write_srt_streaming(output_path, segmentos, fsync_a_cada: int = 50) -> int:
+    """
+    Grava legendas em SRT à medida que o iterável produz os segmentos.
+
+    Para geradores preguiçosos (ex.: segments do faster-whisper), a decodificação
+    acontece durante a escrita; a cada `fsync_a_cada` blocos o arquivo vai para o
+    disco, então uma queda no meio de um vídeo longo preserva o que já saiu.
+
+    Args:
+        output_path: Caminho do arquivo .srt
+        segmentos: Iterável de (início, fim, texto), tempos em segundos
+        fsync_a_cada: Blocos entre cada flush + fsync
+
+    Returns:
+        int: Número de legendas gravadas
+    """
+    total = 0
+    with open(output_path, "w", encoding="utf-8", buffering=1 << 16) as f:
+        for total, (inicio, fim, texto) in enumerate(segmentos, start=1):
+            f.write(f"{total}\n{format_timestamp(inicio)} --> {format_timestamp(fim)}\n{texto}\n\n")
+            if total % fsync_a_cada == 0:
+                f.flush()
+                os.fsync(f.fileno())
+    return total
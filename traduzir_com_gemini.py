@@ -7,55 +7,158 @@ Salva em: videos_output/subtitles_pt/
 """
 
 import os
+import re
 import time
+import hashlib
+import mmap
+import sqlite3
+import random
+import asyncio
+import threading
+from collections import deque
+from functools import lru_cache
 import google.generativeai as genai
+from google.api_core.exceptions import ResourceExhausted, ServiceUnavailable, InternalServerError, DeadlineExceeded
 from pathlib import Path
 from config import SUBTITLES_EN_DIR, SUBTITLES_OUTPUT_DIR, GEMINI_API_KEY, GEMINI_MODEL
 
 # Configurar API
 genai.configure(api_key=GEMINI_API_KEY)
 
-def traduzir_srt_gemini(caminho_entrada, caminho_saida):
-    """Traduz SRT do inglês para português com contexto histórico para consistência."""
-    print(f"🤖 Traduzindo com Gemini: {Path(caminho_entrada).name}")
-    
-    try:
-        with open(caminho_entrada, 'r', encoding='utf-8') as f:
-            conteudo_en = f.read()
-            
-        if not conteudo_en.strip():
-            print("⚠️ Arquivo vazio.")
-            return False
+# Rate limit (HTTP 429): backoff exponencial em vez de pausas fixas
+MAX_TENTATIVAS_429 = 5
+ESPERA_INICIAL_429 = 2  # segundos (dobra a cada tentativa)
+ESPERA_MAXIMA_429 = 32
+# Falhas passageiras que também valem nova tentativa: 5xx, timeout e o ValueError que
+# chunk.text levanta quando a resposta vem bloqueada pelo filtro de segurança
+ERROS_TRANSITORIOS = (ServiceUnavailable, InternalServerError, DeadlineExceeded, ValueError)
+# Dica de espera que o Gemini manda no corpo do 429 ("retry_delay { seconds: 40 }")
+_RETRY_DELAY = re.compile(r'retry_delay\s*\{\s*seconds:\s*(\d+)')
 
-        model = genai.GenerativeModel(GEMINI_MODEL)
-        
-        # Configurações de segurança para evitar bloqueios desnecessários
-        safety_settings = [
-            {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"},
-            {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_NONE"},
-            {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_NONE"},
-            {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"},
-        ]
-        
-        # Parsear o SRT para processar em lotes com contexto
-        import re
-        blocos = re.split(r'\n\n+', conteudo_en.strip())
-        legendas_traduzidas = []
-        contexto_anterior = ""  # Últimas legendas traduzidas para contexto
-        
-        # Processar em lotes de 10 legendas
-        BATCH_SIZE = 10
-        
-        for i in range(0, len(blocos), BATCH_SIZE):
-            lote_atual = blocos[i:i + BATCH_SIZE]
-            lote_texto = "\n\n".join(lote_atual)
-            
-            # MELHORIA: Prompt com contexto histórico para consistência
-            prompt = f"""Você é um tradutor profissional de legendas (SRT).
-Traduza o seguinte trecho do Inglês para Português do Brasil (PT-BR).
+# Separador de blocos SRT (linhas em branco; \r\n aceito mesmo fora do modo texto)
+_BLOCK_SPLIT = re.compile(r'(?:\r?\n){2,}')
 
-CONTEXTO (legendas anteriores já traduzidas - use para manter consistência):
-{contexto_anterior if contexto_anterior else "(início do vídeo)"}
+# Linhas que não se traduzem ([music], (SIGHS), ♪...♪, números, URLs): não vão para o Gemini.
+# Parênteses só contam como marcação quando curtos e em maiúsculas: falas fora de cena
+# como "(I'm over here)" também vêm entre parênteses e precisam ser traduzidas
+_NON_TRANSLATABLE = re.compile(r'^\s*(\[[^\]]*\]|\([^a-z)]{1,30}\)|♪.*♪|♪+|\d+|https?://\S+)\s*$')
+_KEEP = re.compile(r'<<KEEP_(\d+)>>')
+
+# Acima disso o SRT é lido via mmap (decodifica direto do mapeamento, sem cópia em bytes)
+LIMITE_MMAP = 64 * 1024
+
+# Lotes de legendas por requisição e quantos lotes ficam em voo ao mesmo tempo
+BATCH_SIZE = 10
+GEMINI_CONCORRENCIA = 8
+# Cota de requisições por minuto (free tier do Gemini: 15 RPM)
+GEMINI_RPM = int(os.getenv("GEMINI_RPM", 15))
+# Arquivos SRT traduzidos ao mesmo tempo no loop do Gemini (o limitador de RPM é compartilhado)
+ARQUIVOS_PARALELOS = 4
+
+# Cache persistente por linha: falas curtas ("Oh yes.", nomes) se repetem entre vídeos
+ARQUIVO_CACHE_GEMINI = Path(__file__).parent / ".gemini_cache.db"
+CACHE_TTL = 30 * 24 * 3600  # segundos
+_cache_db = None
+_trava_cache = threading.Lock()
+
+# Configurações de segurança para evitar bloqueios desnecessários
+SAFETY_SETTINGS = [
+    {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"},
+    {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_NONE"},
+    {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_NONE"},
+    {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"},
+]
+
+# Event loop único do módulo, numa thread daemon: o cliente async do google.generativeai
+# guarda o canal grpc.aio preso ao primeiro loop que o usou, então todas as chamadas
+# (de qualquer thread ou vídeo) precisam passar pelo mesmo loop
+_loop_gemini = None
+_trava_loop = threading.Lock()
+
+def _obter_loop():
+    """Cria (uma vez por processo) e retorna o event loop das chamadas ao Gemini."""
+    global _loop_gemini
+    with _trava_loop:
+        if _loop_gemini is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="gemini-loop", daemon=True).start()
+            _loop_gemini = loop
+    return _loop_gemini
+
+def rodar_no_loop(coro):
+    """Executa a corrotina no loop do Gemini e bloqueia a thread chamadora até o resultado."""
+    return asyncio.run_coroutine_threadsafe(coro, _obter_loop()).result()
+
+# Limitador de taxa global (vale entre threads e event loops): janela deslizante de 60s.
+# Até GEMINI_RPM chamadas saem na hora; só espera quem passaria da cota na janela.
+_trava_taxa = threading.Lock()
+_slots_reservados = deque()
+
+def reservar_slot_gemini():
+    """Reserva o próximo horário livre dentro da cota de RPM e retorna quantos segundos esperar."""
+    with _trava_taxa:
+        agora = time.monotonic()
+        if len(_slots_reservados) >= GEMINI_RPM:
+            # Libera quando a GEMINI_RPM-ésima reserva mais recente sair da janela
+            slot = max(agora, _slots_reservados[-GEMINI_RPM] + 60)
+        else:
+            slot = agora
+        _slots_reservados.append(slot)
+        while len(_slots_reservados) > GEMINI_RPM:
+            _slots_reservados.popleft()
+    return slot - agora
+
+def espera_429(erro, tentativa):
+    """
+    Segundos a esperar após um 429: usa o retry_delay do Gemini quando vier,
+    senão backoff exponencial com teto. O jitter evita que lotes paralelos
+    acordem todos juntos e estourem a cota de novo.
+    """
+    dica = getattr(erro, "retry_delay", None)
+    if dica is not None:
+        base = getattr(dica, "seconds", dica)
+    else:
+        achado = _RETRY_DELAY.search(str(erro))
+        base = int(achado.group(1)) if achado else min(ESPERA_INICIAL_429 * 2 ** tentativa, ESPERA_MAXIMA_429)
+    return base + random.uniform(0, ESPERA_INICIAL_429)
+
+async def gerar_com_backoff(model, prompt, safety_settings):
+    """
+    Chama o Gemini (async, em streaming) respeitando a cota de RPM. Em 429 (ResourceExhausted)
+    ou erro passageiro (ERROS_TRANSITORIOS) espera com backoff exponencial e tenta de novo;
+    outros erros sobem direto.
+    
+    Returns:
+        str: Texto completo da resposta, montado a partir dos chunks do stream
+    """
+    for tentativa in range(MAX_TENTATIVAS_429):
+        await asyncio.sleep(reservar_slot_gemini())
+        try:
+            resposta = await model.generate_content_async(
+                prompt, safety_settings=safety_settings, stream=True
+            )
+            # Os chunks chegam enquanto o modelo ainda gera; o último pode vir sem texto
+            pedacos = []
+            async for chunk in resposta:
+                if chunk.parts:
+                    pedacos.append(chunk.text)
+            return "".join(pedacos)
+        except ResourceExhausted as erro:
+            if tentativa == MAX_TENTATIVAS_429 - 1:
+                raise
+            espera = espera_429(erro, tentativa)
+            print(f"⏳ Rate limit do Gemini (429), aguardando {espera:.1f}s...")
+            await asyncio.sleep(espera)
+        except ERROS_TRANSITORIOS as erro:
+            if tentativa == MAX_TENTATIVAS_429 - 1:
+                raise
+            espera = min(ESPERA_INICIAL_429 * 2 ** tentativa, ESPERA_MAXIMA_429) + random.uniform(0, ESPERA_INICIAL_429)
+            print(f"⏳ Falha passageira do Gemini ({type(erro).__name__}), nova tentativa em {espera:.1f}s...")
+            await asyncio.sleep(espera)
+
+# Regras fixas: vão como system_instruction do modelo, não repetidas no texto de cada lote
+INSTRUCAO_SISTEMA = """Você é um tradutor profissional de legendas (SRT).
+Traduza os trechos recebidos do Inglês para Português do Brasil (PT-BR).
 
 REGRAS CRÍTICAS:
 1. MANTENHA EXATAMENTE a estrutura do SRT (números de sequência e tempos).
@@ -65,37 +168,249 @@ REGRAS CRÍTICAS:
 5. Adapte gírias e expressões para o contexto brasileiro natural.
 6. Para conteúdo adulto, traduza de forma natural sem censura, mantendo naturalidade.
 7. Termos de parentesco: "Step-" = "Padrasto/Madrasta/Enteado(a)".
+8. Marcadores <<KEEP_n>> devem ser copiados exatamente como estão, na mesma linha.
+"""
+
+# Modelo único, criado na primeira chamada já dentro do loop do Gemini: o GenerativeModel
+# guarda o cliente async do primeiro loop que o usa, e esse loop é sempre o mesmo
+_modelo = None
 
-Trecho SRT para traduzir:
+def obter_modelo():
+    """GenerativeModel do módulo; só deve ser chamado de corrotinas no loop de _obter_loop()."""
+    global _modelo
+    if _modelo is None:
+        _modelo = genai.GenerativeModel(GEMINI_MODEL, system_instruction=INSTRUCAO_SISTEMA)
+    return _modelo
+
+def montar_prompt(lote_texto, contexto_anterior, com_contexto=True):
+    """
+    Parte variável do prompt de um lote (as regras ficam em INSTRUCAO_SISTEMA),
+    com as legendas anteriores como contexto.
+    Com com_contexto=False a seção de contexto sai do prompt (menos tokens por requisição).
+    """
+    secao_contexto = ""
+    if com_contexto:
+        secao_contexto = f"""CONTEXTO (legendas anteriores, em inglês - use para manter consistência):
+{contexto_anterior if contexto_anterior else "(início do vídeo)"}
+
+"""
+    return f"""{secao_contexto}Trecho SRT para traduzir:
 {lote_texto}
 """
+
+def _abrir_cache():
+    """Abre (uma vez por processo) o SQLite do cache de traduções."""
+    global _cache_db
+    if _cache_db is None:
+        _cache_db = sqlite3.connect(str(ARQUIVO_CACHE_GEMINI), isolation_level=None, check_same_thread=False)
+        _cache_db.execute("PRAGMA journal_mode=WAL")
+        _cache_db.execute("PRAGMA synchronous=NORMAL")
+        _cache_db.execute("CREATE TABLE IF NOT EXISTS t(k TEXT PRIMARY KEY, v TEXT, criado REAL)")
+    return _cache_db
+
+def chave_cache(texto):
+    """Chave do cache: texto da legenda + modelo + idioma de destino."""
+    return hashlib.sha1(f"{texto}\0{GEMINI_MODEL}\0pt".encode('utf-8')).hexdigest()
+
+def buscar_cache(textos):
+    """Retorna {texto_en: texto_pt} das linhas já traduzidas (e ainda dentro do TTL)."""
+    chaves = {chave_cache(texto): texto for texto in textos}
+    if not chaves:
+        return {}
+    marcadores = ",".join("?" * len(chaves))
+    with _trava_cache:
+        linhas = _abrir_cache().execute(
+            f"SELECT k, v FROM t WHERE criado > ? AND k IN ({marcadores})",
+            [time.time() - CACHE_TTL, *chaves]
+        ).fetchall()
+    return {chaves[k]: v for k, v in linhas}
+
+def gravar_cache(pares):
+    """Grava pares (texto_en, texto_pt) numa única transação."""
+    agora = time.time()
+    linhas = [(chave_cache(en), pt, agora) for en, pt in pares]
+    if not linhas:
+        return
+    with _trava_cache:
+        db = _abrir_cache()
+        db.execute("BEGIN")
+        db.executemany("INSERT OR REPLACE INTO t(k, v, criado) VALUES (?, ?, ?)", linhas)
+        db.execute("COMMIT")
+
+def dividir_bloco(bloco):
+    """
+    Separa um bloco SRT em (cabeçalho 'número + tempo', linha de tempo, texto).
+    None se não for um bloco válido.
+    """
+    linhas = bloco.strip().split('\n')
+    if len(linhas) < 3 or '-->' not in linhas[1]:
+        return None
+    return '\n'.join(linhas[:2]), linhas[1].strip(), '\n'.join(linhas[2:])
+
+async def traduzir_lotes(lotes, com_contexto=True):
+    """
+    Traduz todos os lotes concorrentemente (até GEMINI_CONCORRENCIA em voo).
+    O contexto de cada lote são as últimas legendas do lote anterior em inglês,
+    então nenhum lote depende da tradução de outro.
+    
+    Gera (lote, resultado) na ordem dos lotes assim que cada um fica pronto;
+    falhas vêm como exceção no resultado.
+    """
+    semaforo = asyncio.Semaphore(GEMINI_CONCORRENCIA)
+    
+    async def traduzir_um(indice):
+        lote = lotes[indice]
+        partes = [dividir_bloco(bloco) for bloco in lote]
+        # SQLite é bloqueante: fica fora da thread do event loop
+        em_cache = await asyncio.to_thread(buscar_cache, {p[2] for p in partes if p})
+        # Blocos só com marcações não-verbais saem como estão, igual a um acerto de cache
+        for p in partes:
+            if p and all(_NON_TRANSLATABLE.match(linha) for linha in p[2].split('\n')):
+                em_cache[p[2]] = p[2]
+        
+        # Só vão para o Gemini os blocos cuja fala ainda não está no cache;
+        # linhas não-verbais no meio deles viram <<KEEP_i>> e voltam depois da resposta
+        preservadas = []
+        
+        def proteger(bloco, p):
+            if not p:
+                return bloco
+            linhas = []
+            for linha in p[2].split('\n'):
+                if _NON_TRANSLATABLE.match(linha):
+                    linhas.append(f"<<KEEP_{len(preservadas)}>>")
+                    preservadas.append(linha)
+                else:
+                    linhas.append(linha)
+            return p[0] + '\n' + '\n'.join(linhas)
+        
+        faltando = [proteger(bloco, p) for bloco, p in zip(lote, partes) if not p or p[2] not in em_cache]
+        traduzidos = {}  # linha de tempo -> texto PT
+        if faltando:
+            contexto = "\n\n".join(lotes[indice - 1][-3:]) if indice and com_contexto else ""
+            prompt = montar_prompt("\n\n".join(faltando), contexto, com_contexto)
+            async with semaforo:
+                texto_resposta = await gerar_com_backoff(obter_modelo(), prompt, SAFETY_SETTINGS)
+            # Limpeza de markdown se houver
+            resposta = texto_resposta.replace("```srt", "").replace("```", "").strip()
+            if preservadas:
+                resposta = _KEEP.sub(
+                    lambda m: preservadas[int(m[1])] if int(m[1]) < len(preservadas) else m[0], resposta
+                )
+            
+            # Casar blocos da resposta com os originais pela linha de tempo
+            for bloco_pt in _BLOCK_SPLIT.split(resposta):
+                p = dividir_bloco(bloco_pt)
+                if p:
+                    traduzidos[p[1]] = p[2]
+            await asyncio.to_thread(gravar_cache, [
+                (p[2], traduzidos[p[1]]) for p in partes
+                if p and p[2] not in em_cache and p[1] in traduzidos
+            ])
+            if len(faltando) == len(lote):
+                # Nada veio do cache: a resposta já é o lote inteiro
+                return resposta
+        
+        # Remonta o lote na ordem original: cache, resposta do Gemini ou o inglês como último recurso
+        blocos_pt = []
+        for bloco, p in zip(lote, partes):
+            if not p:
+                blocos_pt.append(bloco)
+            else:
+                cabecalho, tempo, texto = p
+                blocos_pt.append(f"{cabecalho}\n{em_cache.get(texto) or traduzidos.get(tempo, texto)}")
+        return "\n\n".join(blocos_pt)
+    
+    tarefas = [asyncio.create_task(traduzir_um(i)) for i in range(len(lotes))]
+    for lote, tarefa in zip(lotes, tarefas):
+        try:
+            yield lote, await tarefa
+        except Exception as e:
+            yield lote, e
+
+def ler_srt(caminho):
+    """Lê o SRT como texto; arquivos grandes via mmap, com \r\n normalizado como no modo texto."""
+    if os.path.getsize(caminho) <= LIMITE_MMAP:
+        with open(caminho, 'r', encoding='utf-8') as f:
+            return f.read()
+    with open(caminho, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        conteudo = str(mm, 'utf-8')
+    return conteudo.replace('\r\n', '\n') if '\r' in conteudo else conteudo
+
+@lru_cache(maxsize=32)
+def _parse_srt_blocks(caminho, mtime):
+    """
+    Blocos do SRT, memorizados por (caminho, mtime): re-traduzir o mesmo arquivo
+    (nova tentativa depois de falha) não relê nem re-divide o conteúdo.
+    """
+    conteudo = ler_srt(caminho).strip()
+    return tuple(_BLOCK_SPLIT.split(conteudo)) if conteudo else ()
+
+def traduzir_srt_gemini(caminho_entrada, caminho_saida, *, batch_size=BATCH_SIZE, with_context=True):
+    """
+    Traduz SRT do inglês para português, com os lotes em paralelo sob a cota de RPM.
+    Pode ser chamada de qualquer thread: o trabalho roda no loop único do Gemini.
+    
+    Args:
+        batch_size: Legendas por requisição
+        with_context: Envia as legendas anteriores como contexto em cada lote
+    
+    Returns:
+        bool: True só se todos os lotes foram traduzidos
+    """
+    return rodar_no_loop(traduzir_srt_gemini_async(
+        caminho_entrada, caminho_saida, batch_size=batch_size, with_context=with_context
+    ))
+
+async def traduzir_srt_gemini_async(caminho_entrada, caminho_saida, *, batch_size=BATCH_SIZE, with_context=True):
+    """Versão async de traduzir_srt_gemini; deve rodar no loop de _obter_loop()."""
+    print(f"🤖 Traduzindo com Gemini: {Path(caminho_entrada).name}")
+    
+    try:
+        # Parsear o SRT para processar em lotes com contexto
+        blocos = _parse_srt_blocks(str(caminho_entrada), os.path.getmtime(caminho_entrada))
             
-            try:
-                response = model.generate_content(prompt, safety_settings=safety_settings)
-                traducao_lote = response.text
-                
-                # Limpeza de markdown se houver
-                traducao_lote = traducao_lote.replace("```srt", "").replace("```", "").strip()
-                
-                legendas_traduzidas.append(traducao_lote)
-                
-                # Atualizar contexto com as últimas 3 legendas traduzidas
-                ultimas_legendas = "\n\n".join(traducao_lote.split("\n\n")[-3:])
-                contexto_anterior = ultimas_legendas
-                
-                # Pequena pausa para evitar rate limit
-                time.sleep(1)
-                
-            except Exception as e:
-                print(f"⚠️ Erro no lote {i//BATCH_SIZE + 1}: {str(e)[:50]}")
-                # Em caso de erro, manter o original
-                legendas_traduzidas.append(lote_texto)
+        if not blocos:
+            print("⚠️ Arquivo vazio.")
+            return False
+
+        lotes = [blocos[i:i + batch_size] for i in range(0, len(blocos), batch_size)]
         
-        # Juntar todas as traduções
-        conteudo_pt = "\n\n".join(legendas_traduzidas)
+        # Os lotes vão para um .tmp na ordem em que ficam prontos; o _PT.srt só aparece
+        # (via os.replace) quando todos deram certo. Um arquivo existente = tradução completa
+        caminho_tmp = f"{caminho_saida}.tmp"
         
-        with open(caminho_saida, 'w', encoding='utf-8') as f:
-            f.write(conteudo_pt)
+        async def gravar_lotes(f):
+            numero = falhas = 0
+            async for lote, resultado in traduzir_lotes(lotes, with_context):
+                numero += 1
+                if numero > 1:
+                    f.write("\n\n")
+                if isinstance(resultado, Exception):
+                    # O arquivo inteiro será descartado; os lotes bons já estão no cache
+                    falhas += 1
+                    print(f"⚠️ Erro no lote {numero}: {str(resultado)[:50]}")
+                else:
+                    f.write(resultado)
+            return falhas
+        
+        concluido = False
+        try:
+            with open(caminho_tmp, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                falhas = await gravar_lotes(f)
+                f.flush()
+                os.fsync(f.fileno())
+            
+            if falhas:
+                print(f"❌ {falhas} de {len(lotes)} lotes falharam: {Path(caminho_entrada).name} "
+                      f"(os lotes traduzidos ficaram no cache; rodar de novo só refaz os que faltam)")
+                return False
+            
+            os.replace(caminho_tmp, caminho_saida)
+            concluido = True
+        finally:
+            if not concluido and os.path.exists(caminho_tmp):
+                os.remove(caminho_tmp)
             
         print(f"✅ Tradução salva em: {caminho_saida}")
         return True
@@ -104,14 +419,21 @@ Trecho SRT para traduzir:
         print(f"❌ Erro na tradução: {str(e)}")
         return False
 
+async def traduzir_pendentes(pendentes):
+    """Traduz {srt_en: srt_pt} como tarefas do loop, até ARQUIVOS_PARALELOS ao mesmo tempo."""
+    semaforo = asyncio.Semaphore(ARQUIVOS_PARALELOS)
+    
+    async def traduzir_um(srt_path, saida):
+        async with semaforo:
+            return await traduzir_srt_gemini_async(srt_path, saida)
+    
+    return await asyncio.gather(*(traduzir_um(srt_path, saida) for srt_path, saida in pendentes.items()))
+
 def main():
     os.makedirs(SUBTITLES_OUTPUT_DIR, exist_ok=True)
     
-    srts = sorted([
-        os.path.join(SUBTITLES_EN_DIR, f) 
-        for f in os.listdir(SUBTITLES_EN_DIR) 
-        if f.lower().endswith('_en.srt')
-    ])
+    with os.scandir(SUBTITLES_EN_DIR) as entradas:
+        srts = sorted(e.path for e in entradas if e.name.lower().endswith('_en.srt'))
     
     if not srts:
         print("Nenhum arquivo _EN.srt encontrado para traduzir.")
@@ -119,17 +441,24 @@ def main():
 
     print(f"📋 Encontrados {len(srts)} legendas EN para verificar tradução...")
     
+    # Filtrar antes de despachar: só entram os que ainda não têm _PT.srt
+    pendentes = {}
     for srt_path in srts:
         nome_arquivo = Path(srt_path).stem.replace('_EN', '')
         caminho_saida_pt = os.path.join(SUBTITLES_OUTPUT_DIR, f"{nome_arquivo}_PT.srt")
-        
-        if os.path.exists(caminho_saida_pt):
-            continue # Já existe
-            
-        # Traduzir
-        sucesso = traduzir_srt_gemini(srt_path, caminho_saida_pt)
-        if sucesso:
-            time.sleep(2) # Evitar rate limit agressivo
-            
+        if not os.path.exists(caminho_saida_pt):
+            pendentes[srt_path] = caminho_saida_pt
+    
+    if not pendentes:
+        print("✅ Todas as legendas já estão traduzidas.")
+        return
+    
+    # Cada arquivo é uma tarefa no mesmo loop (o cliente grpc.aio não aceita vários loops);
+    # a cota fica com reservar_slot_gemini
+    resultados = rodar_no_loop(traduzir_pendentes(pendentes))
+    for srt_path, sucesso in zip(pendentes, resultados):
+        if not sucesso:
+            print(f"❌ Falhou: {Path(srt_path).name}")
+
 if __name__ == "__main__":
     main()
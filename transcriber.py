@@ -1,12 +1,22 @@
 # Módulo de Transcrição de Áudio para Vídeos
 
 import os
+
+os.environ.setdefault("OMP_NUM_THREADS", "4")
+
+import importlib.util
 import subprocess
-import pysrt
+from functools import lru_cache
+import numpy as np
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 from logger_config import setup_logger
-from config import INPUT_DIR, OUTPUT_DIR, WHISPER_MODEL, MODELS_DIR
+from srt_writer import write_srt, write_srt_streaming
+from config import (
+    INPUT_DIR, OUTPUT_DIR, WHISPER_MODEL, MODELS_DIR, WHISPER_COMPUTE_TYPE, WHISPER_CPU_THREADS,
+    VAD_PROFILES, VAD_PROFILE, WHISPER_INITIAL_PROMPT
+)
 from alive_progress import alive_bar
 import time
 import warnings
@@ -19,6 +29,84 @@ os.environ["HF_HUB_DISABLE_SYMLINKS_WARNING"] = "1"
 
 logger = setup_logger(__name__)
 
+# Trechos VAD (~30s) por lote no encoder do BatchedInferencePipeline
+BATCH_SIZE_WHISPER = 8
+
+
+@lru_cache(maxsize=1)
+def _check_whisper_cached() -> bool:
+    """
+    Verifica uma vez por processo se o Faster-Whisper está instalado.
+    find_spec só procura o pacote no sys.path, sem importar o módulo.
+    """
+    try:
+        if importlib.util.find_spec("faster_whisper") is not None:
+            logger.info("✓ Biblioteca Faster-Whisper encontrada")
+            return True
+        logger.warning("⚠ Faster-Whisper não encontrada. Instale com: pip install faster-whisper")
+        return False
+    except Exception as e:
+        logger.warning(f"⚠ Erro ao verificar Faster-Whisper: {str(e)}")
+        return False
+
+
+@lru_cache(maxsize=256)
+def _cached_duration(path: str, mtime: float) -> Optional[float]:
+    """
+    Duração via ffprobe, memorizada por (caminho, mtime) do arquivo.
+    Chama o ffprobe direto: importar o video_processor (e o torch dele) só para isso sai caro.
+    """
+    try:
+        out = subprocess.check_output(
+            ["ffprobe", "-v", "error", "-show_entries", "format=duration",
+             "-of", "default=nw=1:nk=1", path],
+            text=True, stderr=subprocess.DEVNULL, timeout=30
+        )
+        return float(out.strip())
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired, OSError, ValueError) as e:
+        logger.error(f"Erro ao obter duração do vídeo: {str(e)}")
+        return None
+
+
+@lru_cache(maxsize=4)
+def _dir_index(dir_str: str, mtime: float) -> frozenset:
+    """
+    Nomes dos arquivos de uma pasta, memorizados por (pasta, mtime da pasta).
+    Passam por normcase para manter o Windows sem distinção de maiúsculas, como o exists().
+    """
+    try:
+        return frozenset(map(os.path.normcase, os.listdir(dir_str)))
+    except OSError:
+        return frozenset()
+
+
+def _list_dir(dir_str: str) -> frozenset:
+    """Índice da pasta: um stat para validar o cache no lugar de um stat por candidato."""
+    try:
+        mtime = os.stat(dir_str).st_mtime
+    except OSError:
+        return frozenset()
+    return _dir_index(dir_str, mtime)
+
+
+def _extract_audio_np(video_path: str) -> Optional[np.ndarray]:
+    """
+    Decodifica só a trilha de áudio (mono, 16 kHz, PCM s16le) via pipe do ffmpeg.
+    Sem WAV intermediário e sem o Whisper re-decodificar o vídeo inteiro.
+    
+    Returns:
+        Áudio float32 em [-1, 1], ou None se o ffmpeg falhar
+    """
+    cmd = [
+        "ffmpeg", "-i", str(video_path),
+        "-vn", "-ac", "1", "-ar", "16000",
+        "-f", "s16le", "-loglevel", "quiet", "-"
+    ]
+    result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    if result.returncode != 0 or not result.stdout:
+        return None
+    return np.frombuffer(result.stdout, np.int16).astype(np.float32) / 32768.0
+
 
 class AudioTranscriber:
     """
@@ -26,77 +114,144 @@ class AudioTranscriber:
     Suporta vídeos sem legendas embutidas.
     """
     
+    # Modelos já carregados, por tamanho (compartilhados entre instâncias):
+    # o peso sai do disco uma vez por sessão, não uma vez por vídeo
+    _models = {}
+    _pipelines = {}
+    
     def __init__(self):
         self.whisper_available = self._check_whisper()
     
     def _check_whisper(self) -> bool:
         """Verifica se Faster-Whisper está instalado."""
-        try:
+        return _check_whisper_cached()
+    
+    def _get_model(self, model_size: str):
+        """Carrega o modelo Faster-Whisper na primeira chamada e reaproveita nas seguintes."""
+        import ctranslate2
+        
+        # GPU NVIDIA: int8_float16 (pesos INT8, ativações FP16). AMD/CPU no Windows: int8
+        # (pesos quantizados, kernels AVX2/AVX-512 do CTranslate2, metade da RAM do FP32).
+        device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+        suportados = ctranslate2.get_supported_compute_types(device)
+        preferidos = ("int8_float16", "float16") if device == "cuda" else ("int8",)
+        
+        compute_type = WHISPER_COMPUTE_TYPE
+        if compute_type != "auto" and compute_type not in suportados:
+            logger.warning(f"compute_type '{compute_type}' não suportado em {device.upper()}; usando seleção automática")
+            compute_type = "auto"
+        if compute_type == "auto":
+            compute_type = next((t for t in preferidos if t in suportados), "auto")
+        
+        chave = (model_size, device, compute_type)
+        model = self._models.get(chave)
+        if model is None:
             from faster_whisper import WhisperModel
-            logger.info("✓ Biblioteca Faster-Whisper encontrada")
-            return True
-        except ImportError:
-            logger.warning("⚠ Faster-Whisper não encontrada. Instale com: pip install faster-whisper")
-            return False
-        except Exception as e:
-            logger.warning(f"⚠ Erro ao verificar Faster-Whisper: {str(e)}")
-            return False
+            
+            logger.info(f"Carregando Faster-Whisper ({model_size})...")
+            logger.info(f"Modo: {device.upper()} ({compute_type.upper()})")
+            model = WhisperModel(
+                model_size, device=device, compute_type=compute_type,
+                cpu_threads=WHISPER_CPU_THREADS, num_workers=1,
+                download_root=str(MODELS_DIR)
+            )
+            self._models[chave] = model
+        return model
+    
+    def _get_pipeline(self, model_size: str):
+        """
+        BatchedInferencePipeline sobre o modelo em cache: corta o áudio em trechos VAD
+        de até 30s e passa vários pelo encoder de uma vez (faster-whisper >= 1.1).
+        None se a versão instalada não tiver o pipeline.
+        """
+        pipeline = self._pipelines.get(model_size)
+        if pipeline is None:
+            try:
+                from faster_whisper import BatchedInferencePipeline
+            except ImportError:
+                return None
+            pipeline = BatchedInferencePipeline(model=self._get_model(model_size))
+            self._pipelines[model_size] = pipeline
+        return pipeline
     
     def transcribe_audio(
         self,
         video_path: str,
-        language: str = "en",
-        model_size: str = WHISPER_MODEL
+        language: str,
+        model_size: str = WHISPER_MODEL,
+        beam_size: int = 1,
+        word_timestamps: bool = False,
+        vad_profile: str = VAD_PROFILE,
+        initial_prompt: Optional[str] = None
     ) -> Optional[str]:
         """
         Transcreve áudio usando Faster-Whisper (extremamente rápido no CPU).
+
+        Decodifica em modo guloso (beam_size=1, temperature=0) por padrão;
+        passe beam_size=5 quando a qualidade importar mais que o tempo.
+        O idioma é obrigatório: sem ele o Whisper gasta uma passada extra do
+        encoder nos primeiros 30s só para detectá-lo.
+        O SRT é por segmento, então word_timestamps (alinhamento DTW por palavra)
+        fica desligado a menos que alguém precise dos tempos de cada palavra.
+        vad_profile escolhe os parâmetros do VAD em config.VAD_PROFILES.
+        initial_prompt (padrão: config.WHISPER_INITIAL_PROMPT) dá ao primeiro trecho
+        o vocabulário esperado, evitando um início de baixa confiança.
         """
         if not self.whisper_available:
             logger.error("Faster-Whisper não disponível.")
             return None
         
+        if vad_profile not in VAD_PROFILES:
+            logger.warning(f"Perfil de VAD '{vad_profile}' desconhecido; usando '{VAD_PROFILE}'")
+            vad_profile = VAD_PROFILE
+        
         video_name = Path(video_path).stem
         srt_output_path = os.path.join(INPUT_DIR, f"{video_name}_transcribed.srt")
         
         try:
-            from faster_whisper import WhisperModel
-            from utils import format_timestamp
-            
-            # Para AMD/CPU no Windows, 'cpu' é a melhor opção.
-            # compute_type='int8' economiza memória e é mais rápido sem perder muita qualidade.
-            device = "cpu"
-            compute_type = "int8"
-            
+            # Com o pipeline em lote os trechos de ~30s são independentes (sem condicionamento
+            # entre eles), o que combina com condition_on_previous_text=False abaixo
+            pipeline = self._get_pipeline(model_size)
+            if pipeline is not None:
+                model = pipeline
+                opcoes_lote = {"batch_size": BATCH_SIZE_WHISPER}
+            else:
+                model = self._get_model(model_size)
+                opcoes_lote = {}
             logger.info(f"Iniciando transcrição com Faster-Whisper ({model_size})...")
-            logger.info(f"Modo: Otimizado para AMD/CPU (INT8)")
             
-            model = WhisperModel(model_size, device=device, compute_type=compute_type, download_root=str(MODELS_DIR))
+            audio = _extract_audio_np(video_path)
+            if audio is None:
+                logger.warning("ffmpeg não decodificou o áudio; o Whisper vai ler o vídeo direto")
+                audio = video_path
             
             # Parâmetros otimizados (Anti-Alucinação)
             segments, info = model.transcribe(
-                video_path, 
+                audio, 
                 language=language, 
-                beam_size=5,
+                beam_size=beam_size,
+                temperature=[0.0],  # Sem a escada de fallback (0.0 ... 1.0): não re-decodifica trechos
+                initial_prompt=initial_prompt or WHISPER_INITIAL_PROMPT,
                 condition_on_previous_text=False,
                 vad_filter=True,
-                vad_parameters=dict(min_speech_duration_ms=250, min_silence_duration_ms=500),
+                vad_parameters=VAD_PROFILES[vad_profile],
                 no_speech_threshold=0.4,
                 log_prob_threshold=-0.9,
-                word_timestamps=True
+                word_timestamps=word_timestamps,
+                **opcoes_lote
             )
             
+            # segments é preguiçoso: a decodificação roda enquanto o SRT é escrito.
+            # Nunca materializar com list() (bloquearia até o fim e dobraria a memória)
+            
             logger.info(f"Idioma: {info.language} | Duração: {info.duration:.2f}s")
+            duracao_vad = getattr(info, "duration_after_vad", None)
+            if duracao_vad is not None and info.duration:
+                removido = 100 * (1 - duracao_vad / info.duration)
+                logger.info(f"VAD ({vad_profile}) removeu {removido:.0f}% do áudio")
             
-            # Salvar como SRT
-            with open(srt_output_path, "w", encoding="utf-8") as f:
-                for i, segment in enumerate(segments, start=1):
-                    start = format_timestamp(segment.start)
-                    end = format_timestamp(segment.end)
-                    text = segment.text.strip()
-                    
-                    f.write(f"{i}\n")
-                    f.write(f"{start} --> {end}\n")
-                    f.write(f"{text}\n\n")
+            # Salvar como SRT em streaming, com fsync a cada 50 legendas
+            write_srt_streaming(srt_output_path, ((seg.start, seg.end, seg.text.strip()) for seg in segments))
             
             logger.info(f"✓ Transcrição concluída: {srt_output_path}")
             return srt_output_path
@@ -117,33 +272,23 @@ class AudioTranscriber:
             Caminho do arquivo SRT criado
         """
         try:
-            from video_processor import VideoProcessor
-            processor = VideoProcessor()
-            duration = processor.get_video_duration(video_path)
+            duration = _cached_duration(str(video_path), os.path.getmtime(video_path))
             
             if not duration:
                 logger.error("Não foi possível obter duração do vídeo")
                 return None
             
-            # Criar SRT com marcações a cada 5 segundos
-            subtitles = pysrt.SubRipFile()
-            index = 1
-            
-            for start_time in range(0, int(duration), 5):
-                end_time = min(start_time + 5, int(duration))
-                
-                sub = pysrt.SubRipItem()
-                sub.index = index
-                sub.start = pysrt.SubRipTime(seconds=start_time)
-                sub.end = pysrt.SubRipTime(seconds=end_time)
-                sub.content = f"[Texto {index}]"  # Placeholder
-                
-                subtitles.append(sub)
-                index += 1
+            # Criar SRT com marcações a cada 5 segundos (inícios/fins calculados de uma vez)
+            starts = np.arange(0, int(duration), 5, dtype=np.int32)
+            ends = np.minimum(starts + 5, int(duration))
             
             video_name = Path(video_path).stem
             srt_output_path = os.path.join(INPUT_DIR, f"{video_name}_template.srt")
-            subtitles.save(srt_output_path, encoding='utf-8')
+            # Mesmo escritor da saída do Whisper: strings direto, sem objetos do pysrt
+            write_srt(srt_output_path, (
+                (start_time, end_time, f"[Texto {i}]")  # Placeholder
+                for i, (start_time, end_time) in enumerate(zip(starts.tolist(), ends.tolist()), start=1)
+            ))
             
             logger.info(f"✓ SRT template criado: {srt_output_path}")
             logger.info(f"  Preencha o template com o texto desejado e use para tradução")
@@ -166,22 +311,32 @@ class AudioTranscriber:
         video_name = Path(video_path).stem
         video_dir = Path(video_path).parent
         
-        # Procura por .srt com mesmo nome
+        # Procura por .srt com mesmo nome (uma listagem por pasta, não um stat por candidato)
         possible_paths = [
-            video_dir / f"{video_name}.srt",
-            Path(INPUT_DIR) / f"{video_name}.srt",
-            video_dir / f"{video_name}_en.srt",
-            Path(INPUT_DIR) / f"{video_name}_en.srt",
+            (video_dir, f"{video_name}.srt"),
+            (Path(INPUT_DIR), f"{video_name}.srt"),
+            (video_dir, f"{video_name}_en.srt"),
+            (Path(INPUT_DIR), f"{video_name}_en.srt"),
         ]
         
-        for srt_path in possible_paths:
-            if srt_path.exists():
+        for pasta, nome in possible_paths:
+            if os.path.normcase(nome) in _list_dir(str(pasta)):
+                srt_path = pasta / nome
                 logger.info(f"✓ Arquivo SRT externo encontrado: {srt_path}")
                 return str(srt_path)
         
         return None
 
 
+@dataclass(slots=True, frozen=True)
+class ProcessingStrategy:
+    """Estratégia escolhida para obter as legendas de um vídeo."""
+    strategy: str
+    srt_path: Optional[str]
+    language: str
+    method: str
+
+
 class VideoWithoutSubtitles:
     """
     Helper para processar vídeos sem legendas.
@@ -189,111 +344,120 @@ class VideoWithoutSubtitles:
     """
     
     @staticmethod
-    def get_processing_strategy(video_path: str, transcriber: AudioTranscriber, prefer_whisper: bool = True, gemini_translator=None) -> dict:
+    def get_processing_strategy(video_path: str, transcriber: AudioTranscriber, prefer_whisper: bool = True, gemini_translator=None, language: str = 'en', initial_prompt: Optional[str] = None, force_whisper: bool = False) -> ProcessingStrategy:
         """
         Determina a melhor estratégia para processar o vídeo.
         
+        Um SRT externo ao lado do vídeo (ou em INPUT_DIR) é verificado antes de
+        tudo: conferir é barato e dispensa a transcrição inteira.
+        
         Args:
             video_path: Caminho do vídeo
             transcriber: Instância do AudioTranscriber
-            prefer_whisper: Se True, prioriza Whisper sobre arquivos externos
+            prefer_whisper: Só muda algo com force_whisper=True: se True, o SRT externo
+                ainda é usado quando o Whisper falha; se False, é ignorado
             gemini_translator: Instância do GeminiTranslator (opcional)
+            language: Idioma falado no vídeo (repassado ao Whisper)
+            initial_prompt: Vocabulário do vídeo para o Whisper (opcional)
+            force_whisper: Se True, transcreve mesmo com SRT externo (que vira só fallback)
         
         Returns:
-            Dict com 'strategy', 'srt_path', 'language', 'method'
+            ProcessingStrategy com strategy, srt_path, language e method
         """
         logger.info("Analisando vídeo sem legendas...")
         
+        # Estratégia 0: SRT externo já pronto (pula o Whisper)
+        if not force_whisper:
+            external_srt = transcriber.check_for_external_srt(video_path)
+            if external_srt:
+                return ProcessingStrategy(
+                    strategy='external_srt',
+                    srt_path=external_srt,
+                    language=language,
+                    method='Arquivo SRT externo encontrado'
+                )
+        
         if prefer_whisper:
             # Estratégia 1: Usar Whisper se disponível (Prioritário para melhor sincronia)
             # logger.info(f"DEBUG: whisper_available = {transcriber.whisper_available}")
             if transcriber.whisper_available:
                 logger.info("🎙️ Iniciando transcrição com Whisper... (pode levar alguns minutos)")
-                srt_path = transcriber.transcribe_audio(video_path, language='en', model_size=WHISPER_MODEL)
+                srt_path = transcriber.transcribe_audio(video_path, language=language, model_size=WHISPER_MODEL, initial_prompt=initial_prompt)
                 # logger.info(f"DEBUG: srt_path retornado = {srt_path}")
                 if srt_path:
-                    return {
-                        'strategy': 'whisper_transcription',
-                        'srt_path': srt_path,
-                        'language': 'en',
-                        'method': 'Transcrição automática com Whisper'
-                    }
+                    return ProcessingStrategy(
+                        strategy='whisper_transcription',
+                        srt_path=srt_path,
+                        language=language,
+                        method='Transcrição automática com Whisper'
+                    )
                 else:
                     logger.warning("Whisper falhou. Tentando estratégias alternativas...")
             
-            # Estratégia 2: Procurar SRT externo
-            external_srt = transcriber.check_for_external_srt(video_path)
-            if external_srt:
-                return {
-                    'strategy': 'external_srt',
-                    'srt_path': external_srt,
-                    'language': 'en',
-                    'method': 'Arquivo SRT externo encontrado'
-                }
+            # Estratégia 2: SRT externo como fallback (sem force_whisper já foi verificado no topo)
+            if force_whisper:
+                external_srt = transcriber.check_for_external_srt(video_path)
+                if external_srt:
+                    return ProcessingStrategy(
+                        strategy='external_srt',
+                        srt_path=external_srt,
+                        language=language,
+                        method='Arquivo SRT externo encontrado'
+                    )
 
             # Estratégia 3: Gemini (Fallback - sincronia pode ser inferior)
             if gemini_translator and hasattr(gemini_translator, 'transcribe_audio_with_gemini'):
                 logger.info("🤖 Whisper não disponível/falhou. Tentando transcrição direta com Gemini...")
                 
                 try:
-                    return {
-                        'strategy': 'gemini_direct',
-                        'srt_path': None,
-                        'language': 'pt',
-                        'method': 'Transcrição/Tradução direta com Gemini'
-                    }
+                    return ProcessingStrategy(
+                        strategy='gemini_direct',
+                        srt_path=None,
+                        language='pt',
+                        method='Transcrição/Tradução direta com Gemini'
+                    )
                 except Exception as e:
                         logger.warning(f"Gemini transcription strategy check falhou: {e}")
 
         else:
-             # Se não preferir Whisper, tenta External -> Whisper -> Gemini
-            # Estratégia 1: Procurar SRT externo
-            external_srt = transcriber.check_for_external_srt(video_path)
-            if external_srt:
-                return {
-                    'strategy': 'external_srt',
-                    'srt_path': external_srt,
-                    'language': 'en',
-                    'method': 'Arquivo SRT externo encontrado'
-                }
-            
+            # Whisper -> Gemini (o SRT externo já foi verificado no topo ou é ignorado com force_whisper)
             # Estratégia 2: Usar Whisper se disponível
             if transcriber.whisper_available:
                 logger.info("🎙️ Iniciando transcrição com Whisper... (pode levar alguns minutos)")
-                srt_path = transcriber.transcribe_audio(video_path, language='en', model_size=WHISPER_MODEL)
+                srt_path = transcriber.transcribe_audio(video_path, language=language, model_size=WHISPER_MODEL, initial_prompt=initial_prompt)
                 if srt_path:
-                    return {
-                        'strategy': 'whisper_transcription',
-                        'srt_path': srt_path,
-                        'language': 'en',
-                        'method': 'Transcrição automática com Whisper'
-                    }
+                    return ProcessingStrategy(
+                        strategy='whisper_transcription',
+                        srt_path=srt_path,
+                        language=language,
+                        method='Transcrição automática com Whisper'
+                    )
 
             # Estratégia 3: Gemini
             if gemini_translator and hasattr(gemini_translator, 'transcribe_audio_with_gemini'):
                 logger.info("🤖 Tentando transcrição direta com Gemini...")
-                return {
-                    'strategy': 'gemini_direct',
-                    'srt_path': None,
-                    'language': 'pt',
-                    'method': 'Transcrição/Tradução direta com Gemini'
-                }
+                return ProcessingStrategy(
+                    strategy='gemini_direct',
+                    srt_path=None,
+                    language='pt',
+                    method='Transcrição/Tradução direta com Gemini'
+                )
         
         # Estratégia 3: Criar template SRT (último recurso)
         logger.warning("⚠️ Whisper, Gemini e SRT externo não disponíveis ou falharam. Criando template...")
         template_srt = transcriber.create_dummy_srt_from_video(video_path)
         if template_srt:
-            return {
-                'strategy': 'manual_template',
-                'srt_path': template_srt,
-                'language': 'en',
-                'method': 'Template SRT criado (preencha manualmente)'
-            }
+            return ProcessingStrategy(
+                strategy='manual_template',
+                srt_path=template_srt,
+                language=language,
+                method='Template SRT criado (preencha manualmente)'
+            )
         
         # Nenhuma estratégia funcionou
-        return {
-            'strategy': 'none',
-            'srt_path': None,
-            'language': 'en',
-            'method': 'Nenhuma estratégia disponível'
-        }
+        return ProcessingStrategy(
+            strategy='none',
+            srt_path=None,
+            language=language,
+            method='Nenhuma estratégia disponível'
+        )
@@ -16,10 +16,17 @@ QUANDO USAR:
 - Quando a sincronia é crítica (legendas profissionais)
 """
 
+import os
+
+os.environ.setdefault("OMP_NUM_THREADS", "4")
+
+import gc
 import subprocess
 import numpy as np
-import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
+from config import MODELS_DIR
 
 # Importações condicionais
 try:
@@ -29,6 +36,18 @@ except ImportError:
     STABLE_TS_AVAILABLE = False
     print("⚠️ stable-ts não instalado. Instale com: pip install stable-ts")
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    import av
+    PYAV_AVAILABLE = True
+except ImportError:
+    PYAV_AVAILABLE = False
+
 try:
     import torch
     CUDA_AVAILABLE = torch.cuda.is_available()
@@ -36,46 +55,172 @@ except:
     CUDA_AVAILABLE = False
 
 
-def carregar_audio_pipe(arquivo_video):
+@lru_cache(maxsize=2)
+def carregar_modelo(modelo, device):
+    """
+    Carrega o modelo Stable-TS uma vez por (modelo, device).
+    Numa pasta com vários vídeos, só o primeiro paga o tempo de carga.
+    
+    Os pesos ficam em models/ (baixados uma vez) e são lidos para a RAM de uma
+    só vez (in_memory) em vez de o torch.load ir e voltar no disco.
+    """
+    try:
+        return stable_whisper.load_model(
+            modelo, device=device, download_root=str(MODELS_DIR), in_memory=True
+        )
+    except TypeError:
+        # Versões antigas do stable-ts sem esses parâmetros
+        return stable_whisper.load_model(modelo, device=device)
+
+
+def liberar_modelo():
+    """Descarta os modelos em cache e devolve a RAM/VRAM ao fim de uma etapa."""
+    carregar_modelo.cache_clear()
+    gc.collect()
+    if CUDA_AVAILABLE:
+        torch.cuda.empty_cache()
+
+
+def obter_duracao(arquivo_video):
+    """Duração do arquivo em segundos via ffprobe, ou None se não conseguir ler."""
+    try:
+        saida = subprocess.run(
+            ["ffprobe", "-v", "error", "-show_entries", "format=duration",
+             "-of", "default=noprint_wrappers=1:nokey=1", arquivo_video],
+            capture_output=True, text=True, timeout=30
+        )
+        return float(saida.stdout.strip())
+    except (subprocess.SubprocessError, OSError, ValueError):
+        return None
+
+
+def carregar_audio_pyav(arquivo_video):
+    """
+    Decodifica o áudio no próprio processo com PyAV (libav), já em float32 mono 16kHz.
+    Sem subprocesso, sem pipe e sem a conversão int16 -> float32.
+    
+    Returns:
+        numpy.array: Áudio em float32, ou None se falhar
+    """
+    try:
+        with av.open(arquivo_video) as container:
+            stream = container.streams.audio[0]
+            resampler = av.audio.resampler.AudioResampler(format="flt", layout="mono", rate=16000)
+            blocos = []
+            for frame in container.decode(stream):
+                for convertido in resampler.resample(frame):
+                    blocos.append(convertido.to_ndarray()[0])
+            # Esvazia o que ficou retido no resampler
+            for convertido in resampler.resample(None):
+                blocos.append(convertido.to_ndarray()[0])
+    except Exception as e:
+        print(f"⚠️ PyAV falhou ({e}); usando o pipe do FFmpeg")
+        return None
+    
+    if not blocos:
+        return None
+    return np.concatenate(blocos)
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True, fastmath=True)
+    def _i16_para_f32(origem, destino):
+        """int16 -> float32 em [-1, 1], numa passada dividida entre os núcleos."""
+        escala = np.float32(1.0 / 32768.0)
+        for i in prange(origem.size):
+            destino[i] = origem[i] * escala
+    
+    # Compila (ou carrega do cache em disco) já na importação, fora do caminho crítico
+    _i16_para_f32(np.zeros(1, np.int16), np.empty(1, np.float32))
+
+
+def pcm_para_float32(amostras):
+    """Converte PCM int16 para float32 normalizado num buffer novo, sem temporários."""
+    audio_array = np.empty(amostras.size, dtype=np.float32)
+    if NUMBA_AVAILABLE:
+        _i16_para_f32(amostras, audio_array)
+    else:
+        np.multiply(amostras, np.float32(1.0 / 32768.0), out=audio_array)
+    return audio_array
+
+
+# Leitura do pipe em blocos de 1 MiB
+BLOCO_PIPE = 1 << 20
+
+
+def carregar_audio_pipe(arquivo_video, normalizar=False):
     """
     Extrai áudio do vídeo direto para RAM usando FFmpeg.
     
     - Sem arquivos temporários (streaming puro)
     - 16kHz mono (formato nativo do Whisper)
-    - Normalização dinâmica para lidar com picos/sussurros
+    - Normalização dinâmica (dynaudnorm) só com normalizar=True: o log-mel do
+      Whisper já tolera variação de nível, e o filtro custa CPU em vídeos longos
+    - PCM lido direto num buffer int16 pré-alocado pela duração do ffprobe
+      (sem o bytes inteiro do communicate() nem cópias intermediárias)
     
     Returns:
         numpy.array: Áudio em float32 normalizado, ou None se falhar
     """
+    # Sem filtro de áudio, o PyAV resolve sem abrir o ffmpeg
+    if PYAV_AVAILABLE and not normalizar:
+        print(f"🔄 Carregando áudio via PyAV: {Path(arquivo_video).name}")
+        audio_array = carregar_audio_pyav(arquivo_video)
+        if audio_array is not None:
+            print(f"✓ Áudio carregado: {len(audio_array) / 16000 / 60:.1f} minutos")
+            return audio_array
+    
     print(f"🔄 Carregando áudio via pipe: {Path(arquivo_video).name}")
     
     comando = [
         "ffmpeg",
+        "-threads", "0",                    # Decodificação com todas as threads
         "-i", arquivo_video,
         "-vn",                              # Sem vídeo
-        "-af", "dynaudnorm=f=150:g=15",     # Normalização dinâmica
+    ]
+    if normalizar:
+        comando += ["-af", "dynaudnorm=f=150:g=15"]  # Normalização dinâmica
+    comando += [
         "-ar", "16000",                     # 16kHz (Whisper native)
         "-ac", "1",                         # Mono
         "-f", "s16le",                      # PCM 16-bit raw
         "-"                                 # stdout
     ]
 
+    # 1s de folga: a duração do container raramente bate com a do áudio
+    duracao = obter_duracao(arquivo_video)
+    capacidade = int(((duracao or 60) + 1) * 16000)
+    buf = np.empty(capacidade, dtype=np.int16)
+    lidos = 0  # em bytes
+
     try:
         processo = subprocess.Popen(
             comando,
             stdout=subprocess.PIPE,
             stderr=subprocess.DEVNULL,
-            bufsize=10**7  # Buffer grande para vídeos longos
+            bufsize=0
         )
         
-        dados_raw, _ = processo.communicate()
+        with processo.stdout as saida:
+            while True:
+                if lidos + BLOCO_PIPE > buf.nbytes:
+                    # Estimativa curta (ou sem ffprobe): dobra o buffer
+                    buf = np.resize(buf, max(2 * buf.size, (lidos + BLOCO_PIPE) // 2))
+                janela = memoryview(buf).cast('B')[lidos:lidos + BLOCO_PIPE]
+                n = saida.readinto(janela)
+                if not n:
+                    break
+                lidos += n
+        processo.wait()
         
-        if processo.returncode != 0 or len(dados_raw) == 0:
+        if processo.returncode != 0 or lidos == 0:
             print("❌ FFmpeg falhou ao processar o vídeo")
             return None
         
-        # Converte bytes para float32 normalizado (-1.0 a 1.0)
-        audio_array = np.frombuffer(dados_raw, np.int16).flatten().astype(np.float32) / 32768.0
+        # Converte para float32 normalizado (-1.0 a 1.0) numa única passada, sem temporários
+        amostras = buf[:lidos // 2]
+        audio_array = pcm_para_float32(amostras)
+        del buf, amostras
         
         duracao_min = len(audio_array) / 16000 / 60
         print(f"✓ Áudio carregado: {duracao_min:.1f} minutos")
@@ -92,7 +237,12 @@ def transcrever_video_longo(
     modelo="large-v3", 
     usar_gpu=None,
     vad_threshold=0.35,
-    idioma="en"
+    idioma="en",
+    beam_size=1,
+    normalizar=False,
+    gpu_id=None,
+    audio=None,
+    so_fala=False
 ):
     """
     Transcreve vídeo longo usando Stable-TS com alinhamento preciso.
@@ -102,7 +252,13 @@ def transcrever_video_longo(
         modelo: Modelo Whisper (large-v3, medium, etc)
         usar_gpu: True/False/None (None = auto-detecta)
         vad_threshold: Sensibilidade do VAD (0.35 = padrão, menor = mais sensível)
-        idioma: Código do idioma (en, pt, es, etc)
+        idioma: Código do idioma (en, pt, es, etc); obrigatório, evita a detecção automática
+        beam_size: 1 = decodificação gulosa (rápida); 5 = beam search (mais lento)
+        normalizar: Aplica dynaudnorm no áudio (gravações muito baixas ou com picos)
+        gpu_id: Índice da GPU (None = GPU padrão do PyTorch)
+        audio: Áudio já decodificado (float32 16kHz); None = extrai do vídeo
+        so_fala: Conteúdo só de fala: sobe o vad_threshold para pelo menos 0.5,
+            cortando mais silêncio/ruído antes do Whisper
     
     Returns:
         Path do SRT gerado ou None se falhar
@@ -111,11 +267,21 @@ def transcrever_video_longo(
         print("❌ stable-ts não está instalado. Execute: pip install stable-ts")
         return None
     
+    # Sem idioma o Whisper roda o encoder nos primeiros 30s só para detectá-lo
+    if not idioma:
+        print("❌ Informe o idioma do vídeo (ex.: idioma='en')")
+        return None
+    
+    if so_fala:
+        vad_threshold = max(vad_threshold, 0.5)
+    
     # Auto-detecta GPU se não especificado
     if usar_gpu is None:
         usar_gpu = CUDA_AVAILABLE
     
     device = "cuda" if usar_gpu else "cpu"
+    if usar_gpu and gpu_id is not None:
+        device = f"cuda:{gpu_id}"
     print(f"\n{'='*70}")
     print(f"🎬 TRANSCRIÇÃO DE VÍDEO LONGO - Stable-TS")
     print(f"{'='*70}")
@@ -128,14 +294,15 @@ def transcrever_video_longo(
     # 1. Carregar modelo Stable-TS
     print(f"⏳ Carregando modelo {modelo}...")
     try:
-        model = stable_whisper.load_model(modelo, device=device)
+        model = carregar_modelo(modelo, device)
         print("✓ Modelo carregado\n")
     except Exception as e:
         print(f"❌ Erro ao carregar modelo: {e}")
         return None
     
-    # 2. Obter áudio via pipe
-    audio = carregar_audio_pipe(video_path)
+    # 2. Obter áudio via pipe (se não veio pré-carregado)
+    if audio is None:
+        audio = carregar_audio_pipe(video_path, normalizar=normalizar)
     if audio is None:
         return None
     
@@ -143,11 +310,18 @@ def transcrever_video_longo(
     print(f"🎙️ Transcrevendo e alinhando timestamps...")
     print(f"   (Isso pode demorar ~2-5x o tempo do vídeo)\n")
     
+    # Whisper usa busca gulosa quando beam_size é None
+    opcoes_decodificacao = {"beam_size": beam_size} if beam_size > 1 else {}
+    
     try:
         result = model.transcribe(
             audio,
             language=idioma,
             
+            # Decodificação gulosa sem fallback de temperatura (re-decodificações custam caro)
+            temperature=0,
+            **opcoes_decodificacao,
+            
             # VAD (Voice Activity Detection) - CRÍTICO para vídeos longos
             vad=True,                    # Usa Silero VAD (superior ao VAD nativo)
             vad_threshold=vad_threshold, # 0.35 = padrão (menor = mais sensível)
@@ -196,10 +370,55 @@ def transcrever_video_longo(
     return srt_path
 
 
-def processar_pasta_videos(pasta_entrada="proximos_para_traducao", modelo="large-v3"):
+def calcular_workers(total_videos, threads=None):
+    """
+    Quantos processos usar na pasta: um por GPU, ou, na CPU, núcleos físicos
+    divididos pelas threads de cada modelo (threads ou OMP_NUM_THREADS).
+    """
+    if CUDA_AVAILABLE:
+        workers = torch.cuda.device_count()
+    else:
+        nucleos_fisicos = max(1, (os.cpu_count() or 2) // 2)
+        threads_por_modelo = threads or int(os.environ.get("OMP_NUM_THREADS", 4))
+        workers = nucleos_fisicos // threads_por_modelo
+    return max(1, min(total_videos, workers))
+
+
+def _iniciar_worker(threads):
+    """Initializer do pool: repassa o --threads do processo pai a cada worker."""
+    if threads and "torch" in globals():
+        torch.set_num_threads(threads)
+
+
+def _processar_lote(videos, modelo, gpu_id=None, so_fala=False):
+    """
+    Worker: transcreve sua fatia de vídeos com um único modelo carregado.
+    O áudio do próximo vídeo é decodificado numa thread enquanto o atual é
+    transcrito, escondendo o custo de abrir o ffmpeg/decodificar a cada arquivo.
+    """
+    sucessos = 0
+    with ThreadPoolExecutor(max_workers=1) as leitor:
+        proximo = leitor.submit(carregar_audio_pipe, videos[0]) if videos else None
+        for i, video in enumerate(videos):
+            audio = proximo.result()
+            proximo = leitor.submit(carregar_audio_pipe, videos[i + 1]) if i + 1 < len(videos) else None
+            
+            print(f"\n▶️ Processando: {Path(video).name}")
+            if audio is not None and transcrever_video_longo(video, modelo=modelo, gpu_id=gpu_id, audio=audio, so_fala=so_fala):
+                sucessos += 1
+            del audio
+    liberar_modelo()
+    return sucessos
+
+
+def processar_pasta_videos(pasta_entrada="proximos_para_traducao", modelo="large-v3", workers=None, so_fala=False, threads=None):
     """
     Processa todos os vídeos de uma pasta usando Stable-TS.
     Ideal para processamento em lote de vídeos longos.
+    
+    Com mais de um worker, cada processo carrega o próprio modelo e recebe uma
+    fatia dos vídeos (uma GPU por processo quando houver várias): a extração do
+    áudio de um vídeo se sobrepõe à decodificação do outro.
     """
     if not STABLE_TS_AVAILABLE:
         print("❌ Instale stable-ts primeiro: pip install stable-ts")
@@ -214,19 +433,40 @@ def processar_pasta_videos(pasta_entrada="proximos_para_traducao", modelo="large
     
     print(f"🎬 Encontrados {len(videos)} vídeos para processar\n")
     
-    sucessos = 0
-    for i, video in enumerate(videos, 1):
-        print(f"\n[{i}/{len(videos)}] Processando: {video.name}")
-        
-        # Pular se já existe SRT stable
+    # Pular os que já têm SRT stable
+    pendentes = []
+    for video in videos:
         srt_esperado = video.with_name(f"{video.stem}_STABLE.srt")
         if srt_esperado.exists():
             print(f"⏭️ Já existe: {srt_esperado.name}")
-            continue
+        else:
+            pendentes.append(str(video))
+    
+    sucessos = 0
+    if pendentes:
+        if workers is None:
+            workers = calcular_workers(len(pendentes), threads)
+        workers = max(1, min(workers, len(pendentes)))
         
-        resultado = transcrever_video_longo(str(video), modelo=modelo)
-        if resultado:
-            sucessos += 1
+        if workers == 1:
+            sucessos = _processar_lote(pendentes, modelo, so_fala=so_fala)
+        else:
+            print(f"⚙️ {workers} processos em paralelo")
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_iniciar_worker, initargs=(threads,)
+            ) as executor:
+                futuros = [
+                    executor.submit(
+                        _processar_lote, pendentes[i::workers], modelo,
+                        i if CUDA_AVAILABLE else None, so_fala
+                    )
+                    for i in range(workers)
+                ]
+                for futuro in as_completed(futuros):
+                    try:
+                        sucessos += futuro.result()
+                    except Exception as e:
+                        print(f"❌ Worker falhou: {e}")
     
     print(f"\n{'='*70}")
     print(f"✅ Processamento em lote concluído: {sucessos}/{len(videos)} vídeos")
@@ -236,6 +476,23 @@ def processar_pasta_videos(pasta_entrada="proximos_para_traducao", modelo="large
 if __name__ == "__main__":
     import sys
     
+    # --threads N: threads intra-op do PyTorch (padrão: OMP_NUM_THREADS)
+    threads = None
+    if "--threads" in sys.argv:
+        i = sys.argv.index("--threads")
+        valor = sys.argv[i + 1] if i + 1 < len(sys.argv) else ""
+        if not valor.isdigit() or int(valor) < 1:
+            print(f"❌ --threads precisa de um número inteiro positivo (recebido: '{valor}')")
+            sys.exit(1)
+        del sys.argv[i:i + 2]
+        threads = int(valor)
+        _iniciar_worker(threads)
+    
+    # --so-fala: conteúdo só de fala (VAD mais agressivo)
+    so_fala = "--so-fala" in sys.argv
+    if so_fala:
+        sys.argv.remove("--so-fala")
+    
     # Verificar instalação
     if not STABLE_TS_AVAILABLE:
         print("\n" + "="*70)
@@ -255,15 +512,16 @@ if __name__ == "__main__":
     print('   python transcritor_stable_ts.py "caminho/video.mp4"\n')
     print("2. Pasta inteira:")
     print('   python transcritor_stable_ts.py --pasta "proximos_para_traducao"\n')
+    print("   Opcional: --threads N (threads de CPU), --so-fala (vídeo sem música, VAD mais agressivo)\n")
     
     if len(sys.argv) > 1:
         if sys.argv[1] == "--pasta":
             pasta = sys.argv[2] if len(sys.argv) > 2 else "proximos_para_traducao"
-            processar_pasta_videos(pasta)
+            processar_pasta_videos(pasta, so_fala=so_fala, threads=threads)
         else:
             video_path = sys.argv[1]
             if os.path.exists(video_path):
-                transcrever_video_longo(video_path)
+                transcrever_video_longo(video_path, so_fala=so_fala)
             else:
                 print(f"❌ Arquivo não encontrado: {video_path}")
     else:
@@ -2,6 +2,7 @@
 
 import os
 import json
+import subprocess
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, Dict, Any
@@ -99,8 +100,29 @@ def get_file_size_mb(file_path: str) -> float:
 
 def format_timestamp(seconds: float) -> str:
     """Converte segundos para formato SRT (HH:MM:SS,mmm)."""
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
-    millis = int((seconds - int(seconds)) * 1000)
+    # Um único arredondamento para ms inteiros; o resto é aritmética inteira
+    millis = round(seconds * 1000)
+    hours, millis = divmod(millis, 3_600_000)
+    minutes, millis = divmod(millis, 60_000)
+    secs, millis = divmod(millis, 1000)
     return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
+
+
+def executar_ffmpeg(cmd, timeout=300, mostrar_erro=True) -> bool:
+    """
+    Executa o FFmpeg sem capturar stdout; o stderr só é decodificado em caso de falha
+    (com -v error ele fica vazio quando tudo corre bem).
+
+    Args:
+        cmd: Comando completo do FFmpeg
+        timeout: Limite em segundos
+        mostrar_erro: Imprime o fim do stderr se falhar (False para tentativas com fallback)
+
+    Returns:
+        bool: True se o FFmpeg terminou com sucesso
+    """
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=timeout)
+    if result.returncode != 0 and mostrar_erro:
+        erro = result.stderr.decode('utf-8', errors='replace').strip()
+        print(f"(ffmpeg: {erro[-200:]})", end=" ", flush=True)
+    return result.returncode == 0
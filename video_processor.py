@@ -3,16 +3,38 @@
 import subprocess
 import os
 import shutil
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 from logger_config import setup_logger
-from config import VIDEOS_OUTPUT_DIR
+from config import VIDEOS_OUTPUT_DIR, FFMPEG_THREADS, VIDEOS_PARALELOS
 from utils import format_timestamp
 from alive_progress import alive_bar
 import time
 
 logger = setup_logger(__name__)
 
+# NVENC com qualidade constante (VBR guiado por -cq), próximo do CRF 23 padrão do libx264
+ARGS_NVENC = ["-c:v", "h264_nvenc", "-preset", "p5", "-rc", "vbr", "-cq", "23", "-b:v", "0"]
+
+@lru_cache(maxsize=1)
+def tem_nvenc() -> bool:
+    """
+    Testa uma vez por processo se o ffmpeg instalado consegue encodar com h264_nvenc.
+    Um encode de 0.1s (com os mesmos parâmetros de qualidade) cobre o build do
+    ffmpeg, o driver e a GPU disponíveis.
+    """
+    try:
+        resultado = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-loglevel", "error",
+             "-f", "lavfi", "-i", "color=s=256x256:d=0.1",
+             *ARGS_NVENC, "-f", "null", "-"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=30
+        )
+        return resultado.returncode == 0
+    except (OSError, subprocess.SubprocessError):
+        return False
+
 
 class VideoProcessor:
     """Classe para processar vídeos usando ffmpeg."""
@@ -31,6 +53,18 @@ class VideoProcessor:
             logger.error("ffmpeg não encontrado! Instale com: pip install ffmpeg-python ou baixe em ffmpeg.org")
             return False
     
+    @staticmethod
+    def video_encoder_args() -> list:
+        """
+        Argumentos de encoder de vídeo: NVENC se o ffmpeg/GPU suportarem, senão libx264.
+        O libx264 só é limitado a FFMPEG_THREADS quando vários vídeos rodam em paralelo.
+        """
+        if tem_nvenc():
+            return list(ARGS_NVENC)
+        if VIDEOS_PARALELOS > 1:
+            return ["-c:v", "libx264", "-threads", str(FFMPEG_THREADS)]
+        return ["-c:v", "libx264"]
+    
     @staticmethod
     def extract_audio(video_path: str, output_audio_path: str = None, format: str = "wav") -> Optional[str]:
         """
@@ -185,7 +219,8 @@ class VideoProcessor:
             # CORREÇÃO: libass no Windows só consegue acessar arquivos no mesmo diretório do vídeo
             # Copiar SRT para a pasta do vídeo em vez de C:\Temp
             video_dir = Path(video_path).parent
-            temp_srt = video_dir / "_temp_subtitle_embed.srt"
+            # PID no nome: vários vídeos da mesma pasta podem ser processados em paralelo
+            temp_srt = video_dir / f"_temp_subtitle_embed_{os.getpid()}.srt"
             
             try:
                 shutil.copy2(srt_path, temp_srt)
@@ -214,6 +249,7 @@ class VideoProcessor:
                     "ffmpeg",
                     "-i", video_abs,
                     "-vf", f"subtitles={srt_filename}:force_style='FontSize=32,Outline=0,BackColour=&H80000000,BorderStyle=4,MarginV=25'",
+                    *VideoProcessor.video_encoder_args(),
                     "-c:a", "copy",
                     "-sn",  # Remover todas as trilhas de legenda existentes
                     "-y",  # sobrescrever
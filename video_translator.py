@@ -187,9 +187,9 @@ class VideoTranslationAgent:
                         gemini_translator=self.translator if use_gemini else None
                     )
                     
-                    logger.info(f"Estratégia selecionada: {strategy['method']}")
+                    logger.info(f"Estratégia selecionada: {strategy.method}")
                     
-                    if strategy['strategy'] == 'gemini_direct':
+                    if strategy.strategy == 'gemini_direct':
                         # Estratégia Gemini: Transcreve e traduz diretamente
                         logger.info("Extraindo áudio para Gemini...")
                         audio_path = self.video_processor.extract_audio(video_path)
@@ -240,9 +240,9 @@ class VideoTranslationAgent:
                             logger.error("Falha ao extrair áudio para Gemini")
                             result = None
 
-                    elif strategy['srt_path']:
-                        srt_path = strategy['srt_path']
-                        source_language = strategy['language']
+                    elif strategy.srt_path:
+                        srt_path = strategy.srt_path
+                        source_language = strategy.language
                         
                         logger.info(f"Etapa 2/4: Traduzindo legendas de {source_language} para {target_language}...")
                         translated_srt = self._translate_srt_file(srt_path, target_language)
@@ -276,8 +276,8 @@ class VideoTranslationAgent:
                             self.metrics.add_error("translate", "Falha ao traduzir legendas extraídas")
                             result = None
                     else:
-                        self.metrics.add_error("transcribe", f"Nenhuma estratégia de extração funcionou: {strategy['method']}")
-                        logger.error(f"✗ {strategy['method']}")
+                        self.metrics.add_error("transcribe", f"Nenhuma estratégia de extração funcionou: {strategy.method}")
+                        logger.error(f"✗ {strategy.method}")
                         result = None
                 
                 else: